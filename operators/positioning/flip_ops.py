@@ -10,6 +10,7 @@ Quick system for flipping light orientation based on various references.
 import bpy
 import bmesh
 import math
+import logging
 from typing import Optional, List
 from mathutils import Vector, Matrix, Euler, Quaternion
 
@@ -28,13 +29,30 @@ from ...utils.scene_analysis import (
 )
 
 
+_log = logging.getLogger(__name__)
+
+# cos of ~1e-4 rad: lights already facing within this need no re-orientation
+_FACING_DOT_TOLERANCE = 0.99999999
+
+# (exception type, message) pairs already reported, to avoid flooding stdout
+_warned = set()
+
+
+def _warn_once(operation_name, error):
+    """Log a warning for an error only the first time it is seen"""
+    key = (type(error).__name__, str(error))
+    if key not in _warned:
+        _warned.add(key)
+        _log.warning("%s: %s", operation_name, error)
+
 
 class LUMI_OT_flip_to_camera_front(bpy.types.Operator):
     """Position light behind target facing camera"""
     bl_idname = "lumiflow.flip_to_camera_front"
     bl_label = "Flip to Camera Front"
     bl_description = "Position light behind target facing camera"
-    bl_options = {'REGISTER', 'UNDO'}
+    bl_options = {'REGISTER', 'UNDO_GROUPED'}
+    bl_undo_group = "lumiflow_flip"
    
     @classmethod
     def poll(cls, context):
@@ -90,6 +108,25 @@ class LUMI_OT_flip_to_camera_front(bpy.types.Operator):
 # FUNGSI BERSAMA UNTUK FLIP OPERATIONS
 # =============================================================================
 
+def _apply_track_rotation(light, direction):
+    """Point light -Z along direction, assigning the quaternion directly
+    
+    Temporarily switching to QUATERNION mode lets Blender convert back to the
+    light's own rotation mode instead of assuming XYZ Euler.
+    Skipped entirely when the light already faces the direction.
+    """
+    forward = light.matrix_basis.to_3x3().normalized() @ Vector((0.0, 0.0, -1.0))
+    if forward.dot(direction) > _FACING_DOT_TOLERANCE:
+        return
+    
+    rot_quat = direction.to_track_quat('-Z', 'Y')
+    prev_mode = light.rotation_mode
+    if prev_mode != 'QUATERNION':
+        light.rotation_mode = 'QUATERNION'
+    light.rotation_quaternion = rot_quat
+    if prev_mode != 'QUATERNION':
+        light.rotation_mode = prev_mode
+
 def get_target_objects_for_light(context, light):
     """Get target objects for light filtering"""
     try:
@@ -363,7 +400,8 @@ class LUMI_OT_flip_to_camera_back(bpy.types.Operator):
     bl_idname = "lumiflow.flip_to_camera_back"
     bl_label = "Flip to Camera Back"
     bl_description = "Position light at same position and distance as camera (co-located)"
-    bl_options = {'REGISTER', 'UNDO'}
+    bl_options = {'REGISTER', 'UNDO_GROUPED'}
+    bl_undo_group = "lumiflow_flip"
 
     @classmethod
     def poll(cls, context):
@@ -441,7 +479,8 @@ class LUMI_OT_flip_to_camera_along(bpy.types.Operator):
     bl_idname = "lumiflow.flip_to_camera_along"
     bl_label = "Flip to Camera Along"
     bl_description = "Position light between target and background but facing background for rim/background lighting"
-    bl_options = {'REGISTER', 'UNDO'}
+    bl_options = {'REGISTER', 'UNDO_GROUPED'}
+    bl_undo_group = "lumiflow_flip"
 
     # BACKGROUND INTEGRATION NOTE:
     # This operator positions light at the SAME POSITION as camera front
@@ -507,7 +546,8 @@ class LUMI_OT_flip_across_pivot(bpy.types.Operator):
     bl_idname = "lumiflow.flip_across_pivot"
     bl_label = "Flip Across Pivot"
     bl_description = "Flip light to opposite side relative to target object or scene center"
-    bl_options = {'REGISTER', 'UNDO'}
+    bl_options = {'REGISTER', 'UNDO_GROUPED'}
+    bl_undo_group = "lumiflow_flip"
 
     @classmethod
     def poll(cls, context):
@@ -617,7 +657,7 @@ class LUMI_OT_flip_across_pivot(bpy.types.Operator):
             return analysis_result.target_objects
             
         except Exception as e:
-            print(f"⚠️ Error in background detection: {e}")
+            _warn_once("background detection", e)
             # Fallback: gunakan semua objek yang dipilih (non-light)
             return [obj for obj in context.selected_objects if obj.type != 'LIGHT']
     
@@ -634,7 +674,7 @@ class LUMI_OT_flip_across_pivot(bpy.types.Operator):
             return analysis_result.target_objects
             
         except Exception as e:
-            print(f"⚠️ Error in background detection: {e}")
+            _warn_once("background detection", e)
             # Fallback: kembalikan semua objek
             return objects
 
@@ -643,7 +683,8 @@ class LUMI_OT_flip_horizontal(bpy.types.Operator):
     bl_idname = "lumiflow.flip_horizontal"
     bl_label = "Flip Horizontal"
     bl_description = "Flip light left ↔ right relative to camera view"
-    bl_options = {'REGISTER', 'UNDO'}
+    bl_options = {'REGISTER', 'UNDO_GROUPED'}
+    bl_undo_group = "lumiflow_flip"
 
     @classmethod
     def poll(cls, context):
@@ -669,7 +710,7 @@ class LUMI_OT_flip_horizontal(bpy.types.Operator):
             return analysis_result.target_objects
             
         except Exception as e:
-            print(f"⚠️ Error in background detection: {e}")
+            _warn_once("background detection", e)
             # Fallback: gunakan semua objek yang dipilih (non-light)
             return [obj for obj in context.selected_objects if obj.type != 'LIGHT']
     
@@ -686,7 +727,7 @@ class LUMI_OT_flip_horizontal(bpy.types.Operator):
             return analysis_result.target_objects
             
         except Exception as e:
-            print(f"⚠️ Error in background detection: {e}")
+            _warn_once("background detection", e)
             # Fallback: kembalikan semua objek
             return objects
 
@@ -754,11 +795,6 @@ class LUMI_OT_flip_horizontal(bpy.types.Operator):
         # STEP 7: Update light position
         light.location = new_light_position
 
-        # STEP 8: CRITICAL - Make light face the pivot (maintain target relationship)
-        direction_to_pivot = (pivot_point - light.location).normalized()
-        rot_quat = direction_to_pivot.to_track_quat('-Z', 'Y')
-        light.rotation_euler = rot_quat.to_euler()
-        
         # Update scene
         context.view_layer.update()
         
@@ -776,10 +812,12 @@ class LUMI_OT_flip_horizontal(bpy.types.Operator):
         if has_obstruction and hit_location:
             lumi_set_light_pivot(light, hit_location)
 
-            # Re-orient light to face new pivot (surface)
-            new_direction_to_pivot = (hit_location - light.location).normalized()
-            rot_quat = new_direction_to_pivot.to_track_quat('-Z', 'Y')
-            light.rotation_euler = rot_quat.to_euler()
+            # Face new pivot (surface)
+            direction_to_pivot = (hit_location - light.location).normalized()
+
+        # STEP 8: CRITICAL - Make light face the pivot (maintain target relationship)
+        # Orientation is resolved once, after the raycast has settled the pivot
+        _apply_track_rotation(light, direction_to_pivot)
         
         # Final scene update
         context.view_layer.update()
@@ -798,7 +836,8 @@ class LUMI_OT_flip_vertical(bpy.types.Operator):
     bl_idname = "lumiflow.flip_vertical"
     bl_label = "Flip Vertical"
     bl_description = "Flip light top ↔ bottom relative to camera view"
-    bl_options = {'REGISTER', 'UNDO'}
+    bl_options = {'REGISTER', 'UNDO_GROUPED'}
+    bl_undo_group = "lumiflow_flip"
 
     @classmethod
     def poll(cls, context):
@@ -824,7 +863,7 @@ class LUMI_OT_flip_vertical(bpy.types.Operator):
             return analysis_result.target_objects
             
         except Exception as e:
-            print(f"⚠️ Error in background detection: {e}")
+            _warn_once("background detection", e)
             # Fallback: gunakan semua objek yang dipilih (non-light)
             return [obj for obj in context.selected_objects if obj.type != 'LIGHT']
     
@@ -841,7 +880,7 @@ class LUMI_OT_flip_vertical(bpy.types.Operator):
             return analysis_result.target_objects
             
         except Exception as e:
-            print(f"⚠️ Error in background detection: {e}")
+            _warn_once("background detection", e)
             # Fallback: kembalikan semua objek
             return objects
 
@@ -904,11 +943,6 @@ class LUMI_OT_flip_vertical(bpy.types.Operator):
         # STEP 7: Update light position
         light.location = new_light_position
 
-        # STEP 8: CRITICAL - Make light face the pivot (maintain target relationship)
-        direction_to_pivot = (pivot_point - light.location).normalized()
-        rot_quat = direction_to_pivot.to_track_quat('-Z', 'Y')
-        light.rotation_euler = rot_quat.to_euler()
-        
         # Update scene
         context.view_layer.update()
         
@@ -926,10 +960,12 @@ class LUMI_OT_flip_vertical(bpy.types.Operator):
         if has_obstruction and hit_location:
             lumi_set_light_pivot(light, hit_location)
 
-            # Re-orient light to face new pivot (surface)
-            new_direction_to_pivot = (hit_location - light.location).normalized()
-            rot_quat = new_direction_to_pivot.to_track_quat('-Z', 'Y')
-            light.rotation_euler = rot_quat.to_euler()
+            # Face new pivot (surface)
+            direction_to_pivot = (hit_location - light.location).normalized()
+
+        # STEP 8: CRITICAL - Make light face the pivot (maintain target relationship)
+        # Orientation is resolved once, after the raycast has settled the pivot
+        _apply_track_rotation(light, direction_to_pivot)
         
         # Final scene update
         context.view_layer.update()
@@ -948,7 +984,8 @@ class LUMI_OT_flip_180_degrees(bpy.types.Operator):
     bl_idname = "lumiflow.flip_180_degrees"
     bl_label = "Flip 180 Degrees"
     bl_description = "Rotate light 180° around world Z axis at pivot point"
-    bl_options = {'REGISTER', 'UNDO'}
+    bl_options = {'REGISTER', 'UNDO_GROUPED'}
+    bl_undo_group = "lumiflow_flip"
 
     @classmethod
     def poll(cls, context):
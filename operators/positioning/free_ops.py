@@ -43,6 +43,10 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
     _pivot_data = {}
     _timer = None
     _initial_positions = {}
+    _mouse_x = 0
+    _mouse_y = 0
+    _last_processed_mouse = None
+    _redrawn_mouse = None
 
     @classmethod
     # # Method to determine when operator/panel is active
@@ -81,9 +85,14 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
             state.set_modal_state('free', True)
             scene.light_props.positioning_mode = 'FREE'
             
+            # Expose cursor position to the overlay through the operator instance
+            self._mouse_x = event.mouse_region_x
+            self._mouse_y = event.mouse_region_y
+            state.register_modal('free', self)
+            
             # Setup modal operator
             context.window_manager.modal_handler_add(self)
-            self._timer = context.window_manager.event_timer_add(0.1, window=context.window)
+            self._timer = context.window_manager.event_timer_add(0.033, window=context.window)
             
             # Enable overlay handler untuk positioning mode
             from ...ui.overlay import lumi_enable_cursor_overlay_handler
@@ -92,6 +101,8 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
             # Initialize dragging state
             self._dragging = True
             self._start_mouse = (event.mouse_region_x, event.mouse_region_y)
+            self._last_processed_mouse = None
+            self._redrawn_mouse = None
             self.store_initial_positions(context)
             
             # Set state for overlay detection
@@ -125,15 +136,21 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
         try:
             # Validate inputs
             if not self.validate_modal_context(context, event):
-                self._dragging = False
+                self.cleanup(context)
                 return {'CANCELLED'}
 
             scene = context.scene
             if not lumi_is_addon_enabled() or scene.light_props.positioning_mode != 'FREE':
-                self._dragging = False
+                self.cleanup(context)
                 return {'CANCELLED'}
 
-            context.area.tag_redraw()
+            # Repaint overlay at timer rate instead of raw input rate, and only once the
+            # cursor has moved since the last repaint so an idle drag costs no redraws
+            if event.type == 'TIMER':
+                mouse = (self._mouse_x, self._mouse_y)
+                if mouse != self._redrawn_mouse:
+                    self._redrawn_mouse = mouse
+                    context.area.tag_redraw()
 
             # # Periksa jenis event (mouse, keyboard, dll)
             if event.type == 'RIGHTMOUSE':
@@ -145,7 +162,6 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
 
             # Check if Ctrl+Shift keys are still held (required for free positioning)
             if not (event.ctrl and event.shift and not event.alt):
-                self._dragging = False
                 self.cleanup(context)
                 return {'CANCELLED'}
 
@@ -166,36 +182,28 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
 
             # Handle mouse movement for free positioning
             if self._dragging and event.type == 'MOUSEMOVE' and event.ctrl and event.shift:
+                # Overlay cursor reads these from the registered operator instance
                 self._mouse_x = event.mouse_region_x
                 self._mouse_y = event.mouse_region_y
                 
-                # Update light orientation for overlay cursor
-                scene = context.scene
-                scene.lumi_smart_mouse_x = event.mouse_region_x
-                scene.lumi_smart_mouse_y = event.mouse_region_y
-                
                 self.update_free_position(context)
                 # # Tetap jalankan modal operator
                 return {'RUNNING_MODAL'}
 
             # Handle mouse release - finish modal operation
             if self._dragging and event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
-                self._dragging = False
-                # End modal operation when mouse is released
-                state = get_state()
-                if state:
-                    state.set_modal_state('free_pressing', False)
-                    state.set_modal_state('free', False)
+                # Commit the final cursor even if it stayed inside the jitter dead zone
+                self._mouse_x = event.mouse_region_x
+                self._mouse_y = event.mouse_region_y
+                last_processed = self._last_processed_mouse
+                if last_processed is not None and last_processed != (self._mouse_x, self._mouse_y):
+                    self.update_free_position(context, force=True)
 
                 # Reset positioning mode untuk konsistensi dengan cancel
                 if hasattr(context.scene, 'light_props'):
                     context.scene.light_props.positioning_mode = 'DISABLE'
 
-                # Disable overlay handler only if no smart control is active
-                if not state.scroll_control_enabled:
-                    from ...ui.overlay import lumi_disable_cursor_overlay_handler
-                    lumi_disable_cursor_overlay_handler()
-
+                # End modal operation when mouse is released
                 self.cleanup(context)
                 self.report({'INFO'}, 'Free positioning completed')
                 return {'FINISHED'}
@@ -209,10 +217,24 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
             return {'PASS_THROUGH'}
 
         except Exception as e:
+            self.cleanup(context)
             return lumi_handle_modal_error(self, context, e, "Free positioning")
 
-    def update_free_position(self, context):
-        """Update light position based on free 2D positioning without depth"""
+    def update_free_position(self, context, force=False):
+        """Update light position based on free 2D positioning without depth
+        
+        Args:
+            context: Blender context
+            force: Apply the cursor even inside the jitter dead zone, used on release
+        """
+        # Skip sub-pixel jitter (squared distance below dead-zone)
+        if self._last_processed_mouse is not None and not force:
+            last_x, last_y = self._last_processed_mouse
+            dx = self._mouse_x - last_x
+            dy = self._mouse_y - last_y
+            if dx * dx + dy * dy < 2:
+                return
+        
         region = context.region
         rv3d = context.region_data
         coord = Vector((self._mouse_x, self._mouse_y))
@@ -276,6 +298,8 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
             except Exception as light_error:
                 lumi_handle_positioning_error(self, context, light_error, f"Light {light.name} update")
                 continue
+        
+        self._last_processed_mouse = (self._mouse_x, self._mouse_y)
     
     def store_initial_positions(self, context):
         """Store initial positions and rotations of lights for cancel restore"""
@@ -308,6 +332,17 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
 
             self._dragging = False
 
+            # Every exit path ends here, so modal state and overlay never outlive the operator
+            state = get_state()
+            state.set_modal_state('free_pressing', False)
+            state.set_modal_state('free', False)
+            state.unregister_modal('free')
+
+            # Disable overlay handler only if no smart control is active
+            if not state.scroll_control_enabled:
+                from ...ui.overlay import lumi_disable_cursor_overlay_handler
+                lumi_disable_cursor_overlay_handler()
+
             # Redraw UI
             for window in context.window_manager.windows:
                 for area in window.screen.areas:
@@ -344,17 +379,8 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
                             del light["Lumi_pivot_world"]
 
             # Clean up state
-            state = get_state()
             scene = context.scene
             lumi_disable_all_positioning_ops(scene)
-            state.set_modal_state('free', False)
-            # Clear pressing state when cancel
-            if state:
-                state.set_modal_state('free_pressing', False)
-                       # Check if object is light and only disable overlay handler if not smart control is active
-            if not state.scroll_control_enabled:
-                from ...ui.overlay import lumi_disable_cursor_overlay_handler
-                lumi_disable_cursor_overlay_handler()
 
             # Reset positioning mode
             if hasattr(context.scene, 'light_props'):
@@ -362,11 +388,8 @@ class LUMI_OT_free_positioning(bpy.types.Operator, BaseModalOperator):
             else:
                 pass
 
-            # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            # Remove timer, clear modal state and unregister like every other exit
+            self.cleanup(context)
 
             self.report({'INFO'}, "Free positioning cancelled - positions restored")
             return {'CANCELLED'}
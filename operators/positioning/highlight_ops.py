@@ -7,25 +7,77 @@ Highlight Operations
 Operators for highlighting and visual feedback of lights.
 """
 import bpy
-import bgl
-import gpu
+import time
+import traceback
+import numpy as np
 from bpy_extras import view3d_utils
 from bpy.types import Operator
-from gpu_extras.batch import batch_for_shader
 from mathutils import Vector
 from ...utils import lumi_is_addon_enabled
-from ...utils.light import lumi_get_light_pivot, lumi_set_light_pivot
+from ...utils.light import lumi_get_light_pivot
 from .utils import (
     lumi_disable_all_positioning_ops, 
     lumi_is_valid_positioning_context, 
     lumi_handle_modal_error, 
     lumi_handle_positioning_error,
     detect_positioning_mode,
-    get_modifier_keys_for_mode
+    get_modifier_keys_for_mode,
+    lumi_get_view3d_areas,
+    lumi_tag_view3d_redraw,
+    lumi_build_bvh_cache,
+    lumi_build_cache_bounds,
+    lumi_scene_ray_cast
 )
 from ...core.state import get_state
+from ...ui.overlay import lumi_enable_cursor_overlay_handler, lumi_disable_cursor_overlay_handler
 from ...base_modal import BaseModalOperator
 
+# Numba is optional, Blender only ships NumPy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Events the highlight modal reacts to; Ctrl keys are kept so releasing Ctrl cancels at once
+MODAL_EVENT_TYPES = {
+    'MOUSEMOVE', 'LEFTMOUSE', 'RIGHTMOUSE', 'ESC',
+    'WHEELUPMOUSE', 'WHEELDOWNMOUSE', 'LEFT_CTRL', 'RIGHT_CTRL'
+}
+
+# Minimum time between sub-2px updates (seconds)
+UPDATE_INTERVAL = 1.0 / 120.0
+
+# Squared tolerance below which consecutive hits are considered identical
+HIT_EPSILON_SQ = 1e-8
+
+
+def _place_lights_numpy(location, reflected, distances, out_locs, out_offsets):
+    """Place each light along the reflected ray, writing into preallocated (N, 3) arrays"""
+    np.multiply(reflected[None, :], distances[:, None], out=out_offsets)
+    np.subtract(location[None, :], out_offsets, out=out_locs)
+
+
+def _place_lights_loop(location, reflected, distances, out_locs, out_offsets):
+    """Scalar loop form of _place_lights_numpy, compiled when Numba is installed"""
+    rx = reflected[0]
+    ry = reflected[1]
+    rz = reflected[2]
+    for i in range(distances.shape[0]):
+        d = distances[i]
+        out_offsets[i, 0] = rx * d
+        out_offsets[i, 1] = ry * d
+        out_offsets[i, 2] = rz * d
+        out_locs[i, 0] = location[0] - rx * d
+        out_locs[i, 1] = location[1] - ry * d
+        out_locs[i, 2] = location[2] - rz * d
+
+
+if NUMBA_AVAILABLE:
+    _place_lights = njit(cache=True, fastmath=True)(_place_lights_loop)
+else:
+    _place_lights = _place_lights_numpy
+
 class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
     bl_idname = "lumi.highlight_positioning"
     bl_label = "Highlight Positioning"
@@ -33,24 +85,29 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
     bl_options = {'REGISTER', 'UNDO'}
 
     _dragging = False
-    _initial_distances = {}
-    _initial_positions = {}
+    _init_locs = None
+    _init_eulers = None
+    _init_rot_modes = []
+    _init_pivots = None
     _mouse_x = 0
     _mouse_y = 0
     _start_mouse = None
-
-    def __del__(self):
-        """Clean up stored data when operator is destroyed"""
-        try:
-            # Only clean up if the object still exists
-            if hasattr(self, '_initial_distances'):
-                self._initial_distances.clear()
-                for light_name in self._initial_positions:
-                    if 'pivot' in self._initial_positions[light_name]:
-                        self._initial_positions[light_name]['pivot'] = None
-                self._initial_positions.clear()
-        except (ReferenceError, AttributeError):
-            pass
+    _selected_lights = ()
+    _distances = None
+    _bvh_cache = []
+    _bounds = None
+    _view_origin = None
+    _view_from_viewport = False
+    _view_origin_stale = False
+    _last_update = 0.0
+    _pending_mouse = None
+    _v3d_areas = []
+    _last_location = None
+    _last_normal = None
+    _out_locs = None
+    _out_offsets = None
+    _scene_center = None
+    _scene_radius = 0.0
 
     @classmethod
     def poll(cls, context):
@@ -69,11 +126,13 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
         """Invoke method - starts modal operator for highlight positioning"""
         try:
             self._dragging = False
-            self._initial_distances = {}
-            self._initial_positions = {}
+            self._init_rot_modes = []
+            self._init_pivots = None
             self._mouse_x = 0
             self._mouse_y = 0
             self._start_mouse = None
+            self._last_update = 0.0
+            self._pending_mouse = None
             
             if not self.validate_context(context):
                 self.report({'ERROR'}, "Invalid context for highlight positioning")
@@ -88,6 +147,7 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
             lumi_disable_all_positioning_ops(scene)
             state = get_state()
             state.set_modal_state('highlight', True)
+            state.register_modal('highlight', self)
             
             scene.light_props.positioning_mode = 'HIGHLIGHT'
             scene.light_props.modal_state = 'highlight'
@@ -97,126 +157,159 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
             self._start_mouse = Vector((event.mouse_region_x, event.mouse_region_y))
             self._mouse_x = event.mouse_region_x
             self._mouse_y = event.mouse_region_y
+            # Camera cannot change mid-drag, resolve the reflection viewpoint once
+            scene_camera = scene.camera
+            self._view_from_viewport = not (scene_camera and scene_camera.type == 'CAMERA')
+            self._view_origin_stale = False
+            if not self._view_from_viewport:
+                self._view_origin = scene_camera.location.copy()
+            else:
+                self.report({'WARNING'}, "No active camera found. Using viewport as fallback.")
+                # Zoom and orbit events pass through the modal, _mark_view_changed re-reads it
+                self._view_origin = context.region_data.view_matrix.inverted().translation.copy()
+            
+            # Selection is frozen for the duration of the drag
+            self._selected_lights = tuple(l for l in context.selected_objects if l.type == 'LIGHT')
             self.store_initial_positions(context)
             
+            # Viewports to redraw are fixed for the modal session
+            self._v3d_areas = lumi_get_view3d_areas(context)
+            
             # Add modal handler
             context.window_manager.modal_handler_add(self)
             
             # Enable overlay handler for positioning mode
-            from ...ui.overlay import lumi_enable_cursor_overlay_handler
             lumi_enable_cursor_overlay_handler()
             
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
             
             return {'RUNNING_MODAL'}
                 
         except Exception as e:
-            import traceback
             error_msg = f"Error in highlight positioning operation: {str(e)}"
             self.report({'ERROR'}, error_msg)
-            traceback.print_exc()
+            if bpy.app.debug:
+                traceback.print_exc()
             return {'CANCELLED'}
 
     def update_highlight_position(self, context):
         """Update highlight position based on mouse movement"""
         try:
-            from bpy_extras import view3d_utils
-            from mathutils import Vector
-            
-            scene = context.scene
-            scene_camera = scene.camera
+            region = context.region
             
-            # Validate active camera
-            if not scene_camera or scene_camera.type != 'CAMERA':
-                self.report({'WARNING'}, "No active camera found. Using viewport as fallback.")
+            # Nothing useful to hit while the pointer is outside the viewport
+            if not (0 <= self._mouse_x < region.width and 0 <= self._mouse_y < region.height):
+                return
             
-            region = context.region
             rv3d = context.region_data
             coord = Vector((self._mouse_x, self._mouse_y))
 
             view_vector = view3d_utils.region_2d_to_vector_3d(region, rv3d, coord)
             ray_origin = view3d_utils.region_2d_to_origin_3d(region, rv3d, coord)
-            hit, location, normal, *_ = scene.ray_cast(
-                context.view_layer.depsgraph, ray_origin, view_vector
+            hit, location, normal, _ = lumi_scene_ray_cast(
+                context, self._bvh_cache, ray_origin, view_vector, self._bounds, self._ray_limit(ray_origin)
             )
+            
+            # The viewport moved since the last update, the reflection viewpoint moved with it
+            if self._view_origin_stale:
+                self._view_origin = rv3d.view_matrix.inverted().translation.copy()
+                self._view_origin_stale = False
+                self._last_location = None
 
             if hit:
-                scene_light_distance = scene.light_distance
+                # Same surface point and normal as last update: lights would not move
+                if (self._last_location is not None
+                        and (location - self._last_location).length_squared < HIT_EPSILON_SQ
+                        and (normal - self._last_normal).length_squared < HIT_EPSILON_SQ):
+                    return
+                self._last_location = location
+                self._last_normal = normal
                 
-                # Always use active camera, not viewport
-                if scene_camera and scene_camera.type == 'CAMERA':
-                    view_origin = scene_camera.location
-                    # Use camera matrix for accurate calculation
-                    camera_matrix = scene_camera.matrix_world
-                    camera_direction = camera_matrix.to_3x3().col[2].normalized()
-                else:
-                    # Fallback to viewport only if no active camera
-                    view_origin = rv3d.view_matrix.inverted().translation
-                    camera_direction = rv3d.view_matrix.to_3x3().col[2].normalized()
+                # Always use active camera, viewport only as fallback
+                view_origin = self._view_origin
                 
                 # Calculate vector from hit location to camera
                 to_camera = (view_origin - location).normalized()
                 
                 # Calculate reflection based on surface normal
-                reflected = to_camera - 2 * to_camera.dot(normal) * normal
-
-                selected_lights = [l for l in context.selected_objects if l.type == 'LIGHT']
+                # Componentwise so no intermediate Vectors are allocated
+                d2 = 2.0 * to_camera.dot(normal)
+                reflected = Vector((
+                    to_camera.x - d2 * normal.x,
+                    to_camera.y - d2 * normal.y,
+                    to_camera.z - d2 * normal.z,
+                ))
+
+                # All lights sit on the same reflected ray, only the distance differs.
+                # Offsets double as the pivot-relative vectors; convert to plain lists
+                # once so the RNA writes below don't unpack NumPy scalars per light.
+                _place_lights(
+                    np.asarray(location), np.asarray(reflected), self._distances,
+                    self._out_locs, self._out_offsets
+                )
+                new_locations = self._out_locs.tolist()
+                relatives = self._out_offsets.tolist()
+                pivot_world = (location.x, location.y, location.z)
+
+                if not self._selected_lights:
+                    return
                 
-                for light in selected_lights:
-                    lumi_set_light_pivot(light, location)
-                    distance = self._initial_distances.get(light.name, scene_light_distance)
-                    new_location = location - reflected * distance
-                    
+                # Every light looks back along the reflected ray at the shared pivot,
+                # so the orientation is identical for all of them. Converting against
+                # the current Euler keeps it continuous with the previous frame.
+                rot_quat = reflected.normalized().to_track_quat('-Z', 'Y')
+                shared_euler = rot_quat.to_euler('XYZ', self._selected_lights[0].rotation_euler)
+
+                for light, new_location, relative in zip(self._selected_lights, new_locations, relatives):
+                    # Direct ID-property writes, same layout as lumi_set_light_pivot
+                    light["Lumi_pivot_world"] = pivot_world
+                    light["Lumi_pivot_relative"] = relative
                     light.location = new_location
-
-                    # Use active camera direction for accurate rotation
-                    pivot = lumi_get_light_pivot(light)
-                    if pivot:
-                        to_pivot = (pivot - light.location).normalized()
-                        # For highlight, point light to pivot considering camera orientation
-                        if scene_camera and scene_camera.type == 'CAMERA':
-                            # Use camera matrix for rotation reference
-                            # to_track_quat only accepts string for second axis
-                            rot_quat = to_pivot.to_track_quat('-Z', 'Y')
-                        else:
-                            # Fallback to viewport if no camera
-                            rot_quat = to_pivot.to_track_quat('-Z', 'Y')
-                        
-                        light.rotation_mode = 'XYZ'
-                        light.rotation_euler = rot_quat.to_euler('XYZ')
-                    else:
-                        pass
+                    light.rotation_euler = shared_euler
         except Exception as e:
             lumi_handle_positioning_error(self, context, e, "Highlight position update")
 
     def store_initial_positions(self, context):
         """Store initial positions and distances of lights for highlight positioning"""
-        self._initial_distances = {}
-        self._initial_positions = {}
         scene = context.scene
         scene_light_distance = scene.light_distance
         
-        selected_lights = [l for l in context.selected_objects if l.type == 'LIGHT']
+        selected_lights = self._selected_lights
+        count = len(selected_lights)
         
-        for light in selected_lights:
-            self._initial_positions[light.name] = {
-                'location': light.location.copy(),
-                'rotation_euler': light.rotation_euler.copy(),
-                'rotation_mode': light.rotation_mode,
-                'pivot': None
-            }
+        # Flat arrays indexed like self._selected_lights
+        self._init_locs = np.empty((count, 3))
+        self._init_eulers = np.empty((count, 3))
+        # NaN rows mark lights that had no pivot
+        self._init_pivots = np.full((count, 3), np.nan)
+        self._init_rot_modes = []
+        # Per-update outputs, reused for the whole drag
+        self._out_locs = np.empty((count, 3))
+        self._out_offsets = np.empty((count, 3))
+        
+        for i, light in enumerate(selected_lights):
+            self._init_locs[i, :] = light.location[:]
+            self._init_eulers[i, :] = light.rotation_euler[:]
+            rotation_mode = light.rotation_mode
+            self._init_rot_modes.append(rotation_mode)
+            # Switch once here, cancel() restores the original mode
+            if rotation_mode != 'XYZ':
+                light.rotation_mode = 'XYZ'
             
             if "Lumi_pivot_world" in light:
                 try:
-                    pivot = lumi_get_light_pivot(light)
-                    self._initial_positions[light.name]['pivot'] = (pivot.x, pivot.y, pivot.z)
+                    self._init_pivots[i, :] = lumi_get_light_pivot(light)
                 except Exception as e:
                     print(f"❌ Error storing pivot for {light.name}: {e}")
-                    self._initial_positions[light.name]['pivot'] = None
+        
+        self._last_location = None
+        self._last_normal = None
+        
+        # Scene geometry is static during the drag, build ray acceleration once.
+        # With instanced geometry the cache is None and rays go through scene.ray_cast.
+        self._bvh_cache = lumi_build_bvh_cache(context)
+        self._bounds = lumi_build_cache_bounds(self._bvh_cache)
         
         region = context.region
         rv3d = context.region_data
@@ -224,36 +317,67 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
         
         view_vector = view3d_utils.region_2d_to_vector_3d(region, rv3d, coord)
         ray_origin = view3d_utils.region_2d_to_origin_3d(region, rv3d, coord)
-        hit, location, normal, *_ = scene.ray_cast(
-            context.view_layer.depsgraph, ray_origin, view_vector
+        
+        # Sphere around all scene bounds; each ray is capped from its own origin since
+        # orthographic views move the origin with the cursor
+        if self._bounds is not None:
+            aabbs = self._bounds
+            lo = aabbs[:, 0].min(axis=0)
+            hi = aabbs[:, 1].max(axis=0)
+            self._scene_center = Vector(((lo + hi) * 0.5).tolist())
+            self._scene_radius = 0.5 * float(np.linalg.norm(hi - lo))
+        else:
+            self._scene_center = None
+        
+        hit, location, normal, _ = lumi_scene_ray_cast(
+            context, self._bvh_cache, ray_origin, view_vector, self._bounds, self._ray_limit(ray_origin)
         )
         
-        for light in selected_lights:
-            if hit:
-                # Calculate actual distance from light to pivot (hit location)
-                actual_distance = (light.location - location).length
-                self._initial_distances[light.name] = actual_distance
-            else:
-                # Fallback to scene light distance if no hit
-                self._initial_distances[light.name] = scene_light_distance
+        # Distances are indexed like self._selected_lights, no per-name lookup needed
+        if hit:
+            # Calculate actual distance from each light to pivot (hit location)
+            self._distances = np.linalg.norm(self._init_locs - np.asarray(location), axis=1)
+        else:
+            # Fallback to scene light distance if no hit
+            self._distances = np.full(count, scene_light_distance, dtype=np.float64)
+
+    def _ray_limit(self, ray_origin):
+        """Longest useful ray from ray_origin: nothing lies beyond the far side of the scene sphere"""
+        if self._scene_center is None:
+            return None
+        return (ray_origin - self._scene_center).length + self._scene_radius + 1e-3
+
+    def _mark_view_changed(self):
+        """Flag the viewport reflection viewpoint for a re-read after a passed-through event
         
+        MMB orbit and pan, wheel zoom, trackpad, NDOF and numpad views all pass through
+        and are applied after modal returns, so the view is read on the next update.
+        """
+        if self._view_from_viewport:
+            self._view_origin_stale = True
 
     def modal(self, context, event):
         """Modal implementation for highlight positioning - Ctrl + LMB drag"""
+        # Timers, keyboard and navigation events pass straight through; navigation can
+        # still move the viewport the reflection falls back to
+        if event.type not in MODAL_EVENT_TYPES:
+            self._mark_view_changed()
+            return {'PASS_THROUGH'}
+        
         # Validate context first
         if not self.validate_modal_context(context, event):
+            self.cleanup(context)
+            self._clear_state()
             return {'CANCELLED'}
         
         try:
-            # Check if we're still in the correct positioning mode
-            detected_mode = detect_positioning_mode(event)
-            
             # If we're already dragging, check if Ctrl is still held
             if self._dragging:
                 # Check if Ctrl key is still held (required for highlight positioning)
                 if not event.ctrl:
                     return self.cancel(context)
-            elif detected_mode != 'HIGHLIGHT':
+            # Check if we're still in the correct positioning mode
+            elif detect_positioning_mode(event) != 'HIGHLIGHT':
                 return {'PASS_THROUGH'}
             
             # Main event handling logic
@@ -262,6 +386,7 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
 
             # Allow wheel scrolling to pass through when Ctrl is held
             if event.type in {'WHEELUPMOUSE', 'WHEELDOWNMOUSE'} and event.ctrl:
+                self._mark_view_changed()
                 return {'PASS_THROUGH'}
 
             # Handle mouse interactions for highlight positioning
@@ -269,53 +394,83 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
                 
                 # Since dragging starts immediately in invoke(), just process mouse movement
                 if self._dragging and event.type == 'MOUSEMOVE':
+                    # Duplicate events at the same pixel cannot change the raycast
+                    dx = event.mouse_region_x - self._mouse_x
+                    dy = event.mouse_region_y - self._mouse_y
+                    if dx == 0 and dy == 0:
+                        return {'RUNNING_MODAL'}
+                    
+                    # Coalesce oversampled input: tiny moves arriving faster than the frame budget
+                    now = time.perf_counter()
+                    if dx * dx + dy * dy < 4 and now - self._last_update < UPDATE_INTERVAL:
+                        # Remembered so the release can still land on the final cursor
+                        self._pending_mouse = (event.mouse_region_x, event.mouse_region_y)
+                        return {'RUNNING_MODAL'}
+                    self._last_update = now
+                    self._pending_mouse = None
+                    
+                    # Overlay cursor reads these from the registered operator instance
                     self._mouse_x = event.mouse_region_x
                     self._mouse_y = event.mouse_region_y
                     
-                    # Update mouse position for overlay cursor
-                    scene = context.scene
-                    scene.lumi_smart_mouse_x = event.mouse_region_x
-                    scene.lumi_smart_mouse_y = event.mouse_region_y
-                    
                     self.update_highlight_position(context)
                     return {'RUNNING_MODAL'}
 
                 # Handle mouse release - finish modal operation
                 if self._dragging and event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
-                    self._dragging = False
-                    # End modal operation when mouse is released
-                    state = get_state()
-                    if state:
-                        state.set_modal_state('highlight', False)
-
+                    # Catch up on a move the throttle skipped so the light matches the cursor
+                    if self._pending_mouse is not None:
+                        self._mouse_x, self._mouse_y = self._pending_mouse
+                        self._pending_mouse = None
+                        self.update_highlight_position(context)
+                    
                     # Reset positioning mode for consistency with cancel
                     if hasattr(context.scene, 'light_props'):
                         context.scene.light_props.positioning_mode = 'DISABLE'
 
-                    # Disable overlay handler only if no smart control is active
-                    if not state.scroll_control_enabled:
-                        from ...ui.overlay import lumi_disable_cursor_overlay_handler
-                        lumi_disable_cursor_overlay_handler()
-
+                    # End modal operation when mouse is released
                     self.cleanup(context)
+                    self._clear_state()
                     self.report({'INFO'}, 'Highlight positioning completed')
                     return {'FINISHED'}
 
             return {'PASS_THROUGH'}
             
         except Exception as e:
+            self.cleanup(context)
+            self._clear_state()
             return lumi_handle_modal_error(self, context, e, "Highlight positioning")
 
+    def _clear_state(self):
+        """Drop per-drag data once positions are committed or restored"""
+        self._distances = None
+        self._init_locs = None
+        self._init_eulers = None
+        self._init_rot_modes = []
+        self._init_pivots = None
+        self._out_locs = None
+        self._out_offsets = None
+
     def cleanup(self, context):
         """Clean up highlight positioning state"""
         try:
             self._dragging = False
 
+            # Every exit path ends here, so modal state and overlay never outlive the operator
+            state = get_state()
+            state.set_modal_state('highlight', False)
+            state.unregister_modal('highlight')
+
+            # Disable overlay handler only if no smart control is active
+            if not state.scroll_control_enabled:
+                lumi_disable_cursor_overlay_handler()
+
+            self._bvh_cache = []
+            self._bounds = None
+            self._scene_center = None
+
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
 
             super().cleanup(context)
 
@@ -329,27 +484,22 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
             self._start_mouse = None
 
             # Restore initial positions, rotations, and pivots for all selected lights
-            selected_lights = [l for l in context.selected_objects if l.type == 'LIGHT']
-            for light in selected_lights:
-                if light.name in self._initial_positions:
-                    initial_data = self._initial_positions[light.name]
+            if self._init_rot_modes:
+                has_pivot = ~np.isnan(self._init_pivots[:, 0])
+                rows = zip(
+                    self._selected_lights, self._init_locs.tolist(), self._init_eulers.tolist(),
+                    self._init_rot_modes, self._init_pivots.tolist(), has_pivot.tolist()
+                )
+                for light, location, rotation_euler, rotation_mode, pivot, pivot_stored in rows:
                     # Restore position
-                    light.location = initial_data['location'].copy()
+                    light.location = location
                     # Restore rotation
-                    light.rotation_mode = initial_data['rotation_mode']
-                    light.rotation_euler = initial_data['rotation_euler'].copy()
+                    light.rotation_mode = rotation_mode
+                    light.rotation_euler = rotation_euler
                     # Restore pivot if it was stored
-                    if initial_data['pivot'] is not None:
-                        light["Lumi_pivot_world"] = initial_data['pivot']
-
-            # Clean up state
-            state = get_state()
-            state.set_modal_state('highlight', False)
-
-            # Disable overlay handler only if no smart control is active
-            if not state.scroll_control_enabled:
-                from ...ui.overlay import lumi_disable_cursor_overlay_handler
-                lumi_disable_cursor_overlay_handler()
+                    if pivot_stored:
+                        light["Lumi_pivot_world"] = pivot
+            self._clear_state()
 
             # Reset positioning mode
             if hasattr(context.scene, 'light_props'):
@@ -357,18 +507,16 @@ class LUMI_OT_highlight_positioning(bpy.types.Operator, BaseModalOperator):
             else:
                 pass
 
-            # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            # Drop caches, clear modal state and unregister like every other exit
+            self.cleanup(context)
 
             self.report({'INFO'}, "Highlight positioning cancelled - positions restored")
             return {'CANCELLED'}
 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            if bpy.app.debug:
+                traceback.print_exc()
+            self.cleanup(context)
             return {'CANCELLED'}
 
 
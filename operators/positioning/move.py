@@ -8,8 +8,10 @@ Operators for moving and positioning lights.
 """
 # Import main Blender modules
 import bpy
+import traceback
+import numpy as np
 from mathutils import Vector
-from bpy_extras import view3d_utils
+from bpy_extras.view3d_utils import region_2d_to_vector_3d, region_2d_to_origin_3d
 from ...utils import lumi_is_addon_enabled
 from ...utils.light import lumi_set_light_pivot, lumi_get_light_pivot
 from .utils import (
@@ -18,12 +20,81 @@ from .utils import (
     lumi_handle_modal_error, 
     lumi_handle_positioning_error,
     detect_positioning_mode,
-    get_modifier_keys_for_mode
+    get_modifier_keys_for_mode,
+    lumi_get_view3d_areas,
+    lumi_tag_view3d_redraw,
+    InitialTransform
 )
 
 from ...core.state import get_state
+from ...ui.overlay import lumi_enable_cursor_overlay_handler, lumi_disable_cursor_overlay_handler
 from ...base_modal import BaseModalOperator
 
+# Squared Euler difference below which the light rotation is left untouched
+ROTATION_EPSILON_SQ = 1e-8
+
+# Below this many lights the per-light mathutils path beats NumPy setup cost
+BATCH_MIN_LIGHTS = 8
+
+
+def _pivot_to_cursor(pivot, persp, persp_inv, ndc, half_size):
+    """Move a pivot onto the cursor at its own NDC depth
+    
+    Args:
+        pivot: World-space pivot
+        persp: View perspective matrix
+        persp_inv: Inverse of persp
+        ndc: Cursor in normalized device coordinates (x, y)
+        half_size: Half the region size in pixels (width, height)
+    
+    Returns:
+        tuple: (in_front, new_pivot). new_pivot is None when the pivot is already
+        within a pixel of the cursor or projects behind the view
+    """
+    projected = persp @ pivot.to_4d()
+    if projected.w <= 0.0:
+        return False, None
+    
+    # Pivot already sits under the cursor (sub-pixel), nothing to move
+    screen_dx = (ndc[0] - projected.x / projected.w) * half_size[0]
+    screen_dy = (ndc[1] - projected.y / projected.w) * half_size[1]
+    if screen_dx * screen_dx + screen_dy * screen_dy < 1.0:
+        return True, None
+    
+    # Unproject the cursor at the pivot's NDC depth, i.e. onto the
+    # screen-parallel plane through the pivot, so it follows the cursor
+    depth = projected.z / projected.w
+    unprojected = persp_inv @ Vector((ndc[0], ndc[1], depth, 1.0))
+    return True, unprojected.xyz / unprojected.w
+
+
+def _pivots_to_cursor(pivots, persp, persp_inv, ndc, half_size):
+    """Batched _pivot_to_cursor over a list of pivots, one NumPy pass for all lights"""
+    count = len(pivots)
+    homogeneous = np.ones((count, 4))
+    homogeneous[:, :3] = pivots
+    
+    clip = homogeneous @ np.array(persp).T
+    w = clip[:, 3]
+    in_front = w > 0.0
+    pivot_ndc = clip[:, :3] / np.where(in_front, w, 1.0)[:, None]
+    
+    screen_delta = (np.asarray(ndc) - pivot_ndc[:, :2]) * np.asarray(half_size)
+    moved = in_front & (np.einsum('ij,ij->i', screen_delta, screen_delta) >= 1.0)
+    
+    target = np.ones((count, 4))
+    target[:, :2] = ndc
+    target[:, 2] = pivot_ndc[:, 2]
+    world = target @ np.array(persp_inv).T
+    # Rows behind the view are discarded below, silence their degenerate divisions
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_pivots = world[:, :3] / world[:, 3:4]
+    
+    return [
+        (front, Vector(new_pivot) if is_moved else None)
+        for front, is_moved, new_pivot in zip(in_front.tolist(), moved.tolist(), new_pivots.tolist())
+    ]
+
 # Class definition for Operator - Refactored for Positioning Mode
 class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
     bl_idname = "lumi.move_positioning"
@@ -34,7 +105,11 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
     _dragging = False
     _start_mouse = None
     _initial_positions = {}
-    _timer = None
+    _last_mouse = (-1, -1)
+    _v3d_areas = []
+    _lights = ()
+    _mouse_x = 0
+    _mouse_y = 0
 
     @classmethod
     # # Method to determine when operator/panel is active
@@ -73,41 +148,38 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
             state.set_modal_state('move', True)
             scene.light_props.positioning_mode = 'MOVE'
             
+            # Expose cursor position to the overlay through the operator instance
+            self._mouse_x = event.mouse_region_x
+            self._mouse_y = event.mouse_region_y
+            state.register_modal('move', self)
+            
             # Setup modal operator
             context.window_manager.modal_handler_add(self)
-            self._timer = context.window_manager.event_timer_add(0.1, window=context.window)
+            
+            # Viewports to redraw for the rest of the session
+            self._v3d_areas = lumi_get_view3d_areas(context)
             
             # Enable overlay handler for positioning mode
-            from ...ui.overlay import lumi_enable_cursor_overlay_handler
             lumi_enable_cursor_overlay_handler()
             
             # Initialize dragging state
             self._dragging = True
             self._start_mouse = (event.mouse_region_x, event.mouse_region_y)
+            self._last_mouse = (-1, -1)
             self.store_initial_positions(context)
             
             # Set state for overlay detection
             if state:
                 state.set_modal_state('move_pressing', True)
-                # Force overlay redraw
-                for window in bpy.context.window_manager.windows:
-                    for area in window.screen.areas:
-                        if area.type == 'VIEW_3D':
-                            area.tag_redraw()
             
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
             
             return {'RUNNING_MODAL'}
                 
         except Exception as e:
-            import traceback
             error_msg = f"Error in move positioning operation: {str(e)}"
             self.report({'ERROR'}, error_msg)
-            pass
             return {'CANCELLED'}
 
     # # Main method for modal operator
@@ -115,6 +187,7 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
         """Modal implementation for move positioning"""
         # Validate context first
         if not self.validate_modal_context(context, event):
+            self.cleanup(context)
             return {'CANCELLED'}
 
         try:
@@ -128,7 +201,6 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
 
             # Check if Shift+Alt keys are still held (required for move positioning)
             if not (not event.ctrl and event.shift and event.alt):
-                self._dragging = False
                 self.cleanup(context)
                 return {'CANCELLED'}
 
@@ -142,44 +214,33 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
                     state = get_state()
                     if state:
                         state.set_modal_state('move_pressing', True)
-                        # Force overlay redraw
-                        for window in bpy.context.window_manager.windows:
-                            for area in window.screen.areas:
-                                if area.type == 'VIEW_3D':
-                                    area.tag_redraw()
                 return {'RUNNING_MODAL'}
 
             # Handle mouse movement for move positioning
             if self._dragging and event.type == 'MOUSEMOVE' and event.shift and event.alt:
+                # Repeated events at the same pixel would redo identical work
+                mouse = (event.mouse_region_x, event.mouse_region_y)
+                if mouse == self._last_mouse:
+                    return {'RUNNING_MODAL'}
+                self._last_mouse = mouse
+                
                 self._mouse_x = event.mouse_region_x
                 self._mouse_y = event.mouse_region_y
                 
-                # Update mouse position for overlay cursor
-                scene = context.scene
-                scene.lumi_smart_mouse_x = event.mouse_region_x
-                scene.lumi_smart_mouse_y = event.mouse_region_y
-                
                 self.update_move_position(context)
+                
+                # Overlay reads the cursor from this operator, only the active view needs it
+                if context.area:
+                    context.area.tag_redraw()
                 return {'RUNNING_MODAL'}
 
             # Handle mouse release - finish modal operation
             if self._dragging and event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
-                self._dragging = False
-                # End modal operation when mouse is released
-                state = get_state()
-                if state:
-                    state.set_modal_state('move_pressing', False)
-                    state.set_modal_state('move', False)
-
                 # Reset positioning mode for consistency with cancel
                 if hasattr(context.scene, 'light_props'):
                     context.scene.light_props.positioning_mode = 'DISABLE'
 
-                # Disable overlay handler only if no smart control is active
-                if not state.scroll_control_enabled:
-                    from ...ui.overlay import lumi_disable_cursor_overlay_handler
-                    lumi_disable_cursor_overlay_handler()
-
+                # End modal operation when mouse is released
                 self.cleanup(context)
                 self.report({'INFO'}, 'Move positioning completed')
                 return {'FINISHED'}
@@ -193,25 +254,26 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
             return {'PASS_THROUGH'}
             
         except Exception as e:
+            self.cleanup(context)
             return lumi_handle_modal_error(self, context, e, "Move positioning")
 
     def store_initial_positions(self, context):
         """Store initial positions and rotations of lights for cancel restore"""
         self._initial_positions = {}
         selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
+        # Selection does not change mid-drag, reused by every update
+        self._lights = tuple(selected_lights)
         
         # Store initial positions, rotations, rotation modes, and pivots for all selected lights
         for light in selected_lights:
-            self._initial_positions[light.name] = {
-                'location': light.location.copy(),
-                'rotation_euler': light.rotation_euler.copy(),
-                'rotation_mode': light.rotation_mode,
-                'pivot': None  # Initialize pivot storage
-            }
+            initial = InitialTransform(light)
             
-            # Store initial pivot position if it exists
+            # Store initial pivot position if it exists. Copied out because the ID
+            # property array is replaced by the first pivot write of the drag.
             if "Lumi_pivot_world" in light:
-                self._initial_positions[light.name]['pivot'] = tuple(light["Lumi_pivot_world"])
+                initial.pivot = tuple(light["Lumi_pivot_world"])
+            
+            self._initial_positions[light.name] = initial
 
     def update_move_position(self, context):
         """Update light and pivot positions together based on 2D movement - natural movement like Free mode"""
@@ -219,80 +281,64 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
         rv3d = context.region_data
         coord = Vector((self._mouse_x, self._mouse_y))
 
-        selected_objects = context.selected_objects
+        # Projection is shared by every light, derive it once per update
+        persp = rv3d.perspective_matrix
+        persp_inv = persp.inverted()
+        half_size = (region.width / 2.0, region.height / 2.0)
+        ndc = (coord.x / half_size[0] - 1.0, coord.y / half_size[1] - 1.0)
         
-        for light in selected_objects:
-            if light.type != 'LIGHT':
-                continue
+        # Cursor ray, built on first use by the behind-view fallback
+        view_vector = None
+        ray_origin = None
+        
+        lights = self._lights
+        pivots = []
+        for light in lights:
+            # Get current pivot position
+            current_pivot = lumi_get_light_pivot(light)
+            if current_pivot is None:
+                # If no pivot exists, create one at a reasonable distance in front of the light
+                current_pivot = light.location + Vector((0, 0, -2))
+            pivots.append(current_pivot)
+        
+        if len(lights) >= BATCH_MIN_LIGHTS:
+            targets = _pivots_to_cursor(pivots, persp, persp_inv, ndc, half_size)
+        else:
+            targets = [_pivot_to_cursor(pivot, persp, persp_inv, ndc, half_size) for pivot in pivots]
 
+        for light, current_pivot, (in_front, new_pivot_location) in zip(lights, pivots, targets):
             try:
-                # Get current pivot position
-                current_pivot = lumi_get_light_pivot(light)
-                if current_pivot is None:
-                    # If no pivot exists, create one at a reasonable distance in front of the light
-                    current_pivot = light.location + Vector((0, 0, -2))
+                if in_front:
+                    if new_pivot_location is None:
+                        continue
+                else:
+                    # Fallback: use ray casting at current depth if projection fails
+                    if ray_origin is None:
+                        view_vector = region_2d_to_vector_3d(region, rv3d, coord)
+                        ray_origin = region_2d_to_origin_3d(region, rv3d, coord)
+                    camera_distance = (ray_origin - current_pivot).length
+                    new_pivot_location = ray_origin + view_vector * camera_distance
                 
-                # Store initial light-to-pivot offset for maintaining relationship
+                # Light-to-pivot offset is kept to maintain the relationship
                 initial_light_to_pivot = current_pivot - light.location
                 
-                # Get viewport origin for distance calculation
-                view_vector = view3d_utils.region_2d_to_vector_3d(region, rv3d, coord)
-                ray_origin = view3d_utils.region_2d_to_origin_3d(region, rv3d, coord)
+                # Move light to maintain the same relative offset from the new pivot
+                new_light_location = new_pivot_location - initial_light_to_pivot
                 
-                # Project current pivot to screen coordinates
-                pivot_screen = view3d_utils.location_3d_to_region_2d(region, rv3d, current_pivot)
+                # Apply the new positions
+                light.location = new_light_location
+                lumi_set_light_pivot(light, new_pivot_location)
                 
-                if pivot_screen is not None:
-                    # Calculate screen space movement from current pivot to cursor
-                    screen_delta = coord - pivot_screen
-                    
-                    # Use perspective projection to calculate accurate world-space movement
-                    # This method properly accounts for viewport depth and perspective
-                    offset_coord = Vector((pivot_screen.x + screen_delta.x, pivot_screen.y + screen_delta.y))
-                    
-                    # Convert both positions from screen to world space at the same depth
-                    pivot_world = view3d_utils.region_2d_to_location_3d(region, rv3d, pivot_screen, current_pivot)
-                    offset_world = view3d_utils.region_2d_to_location_3d(region, rv3d, offset_coord, current_pivot)
-                    
-                    # Calculate actual world movement vector
-                    world_movement = offset_world - pivot_world
-                    
-                    # Move pivot to new position (following cursor naturally)
-                    new_pivot_location = current_pivot + world_movement
-                    
-                    # Move light to maintain the same relative offset from the new pivot
-                    new_light_location = new_pivot_location - initial_light_to_pivot
-                    
-                    # Apply the new positions
-                    light.location = new_light_location
-                    lumi_set_light_pivot(light, new_pivot_location)
-                    
-                    # Make light face the pivot
-                    direction_vector = new_pivot_location - new_light_location
-                    if direction_vector.length > 0.001:
-                        to_pivot = direction_vector.normalized()
-                        rot_quat = to_pivot.to_track_quat('-Z', 'Y')
+                # Make light face the pivot
+                direction_vector = new_pivot_location - new_light_location
+                if direction_vector.length > 0.001:
+                    to_pivot = direction_vector.normalized()
+                    rot_euler = to_pivot.to_track_quat('-Z', 'Y').to_euler('XYZ')
+                    # Enum and Euler writes tag the depsgraph even when the value is the same
+                    if light.rotation_mode != 'XYZ':
                         light.rotation_mode = 'XYZ'
-                        light.rotation_euler = rot_quat.to_euler('XYZ')
-                else:
-                    # Fallback: use ray casting at current depth if projection fails
-                    camera_distance = (ray_origin - current_pivot).length
-                    new_pivot_location = ray_origin + view_vector * camera_distance
-                    
-                    # Move light to maintain the same relative offset from the new pivot
-                    new_light_location = new_pivot_location - initial_light_to_pivot
-                    
-                    # Apply the new positions
-                    light.location = new_light_location
-                    lumi_set_light_pivot(light, new_pivot_location)
-                    
-                    # Make light face the pivot
-                    direction_vector = new_pivot_location - new_light_location
-                    if direction_vector.length > 0.001:
-                        to_pivot = direction_vector.normalized()
-                        rot_quat = to_pivot.to_track_quat('-Z', 'Y')
-                        light.rotation_mode = 'XYZ'
-                        light.rotation_euler = rot_quat.to_euler('XYZ')
+                    if (Vector(light.rotation_euler) - Vector(rot_euler)).length_squared > ROTATION_EPSILON_SQ:
+                        light.rotation_euler = rot_euler
                     
             except Exception as light_error:
                 lumi_handle_positioning_error(self, context, light_error, f"Light {light.name} update")
@@ -301,21 +347,20 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
     def cleanup(self, context):
         """Clean up move positioning state"""
         try:
-            # Remove timer if it exists
-            try:
-                if self._timer is not None:
-                    context.window_manager.event_timer_remove(self._timer)
-                    self._timer = None
-            except Exception as e:
-                lumi_handle_positioning_error(self, context, e, "Move cleanup")
-
             self._dragging = False
 
+            # Every exit path ends here, so modal state and overlay never outlive the operator
+            state = get_state()
+            state.set_modal_state('move_pressing', False)
+            state.set_modal_state('move', False)
+            state.unregister_modal('move')
+
+            # Disable overlay handler only if no smart control is active
+            if not state.scroll_control_enabled:
+                lumi_disable_cursor_overlay_handler()
+
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
 
             super().cleanup(context)
 
@@ -328,37 +373,15 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
             self._dragging = False
             self._start_mouse = None
 
-            # Restore initial positions, rotations, and pivots for all selected lights
-            selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
-            for light in selected_lights:
-                if light.name in self._initial_positions:
-                    initial_data = self._initial_positions[light.name]
-                    # Restore position
-                    light.location = initial_data['location'].copy()
-                    # Restore rotation
-                    light.rotation_mode = initial_data['rotation_mode']
-                    light.rotation_euler = initial_data['rotation_euler'].copy()
-                    # Restore pivot if it was stored
-                    if initial_data['pivot'] is not None:
-                        light["Lumi_pivot_world"] = initial_data['pivot']
-                    else:
-                        # If no initial pivot stored, remove pivot
-                        if "Lumi_pivot_world" in light:
-                            del light["Lumi_pivot_world"]
+            # Restore initial positions, rotations, and pivots for the lights captured at drag start
+            for light in self._lights:
+                initial = self._initial_positions.get(light.name)
+                if initial is not None:
+                    initial.restore(light)
 
             # Clean up state
-            state = get_state()
             scene = context.scene
             lumi_disable_all_positioning_ops(scene)
-            state.set_modal_state('move', False)
-            # Clear pressing state when cancel
-            if state:
-                state.set_modal_state('move_pressing', False)
-
-            # Disable overlay handler only if no smart control is active
-            if not state.scroll_control_enabled:
-                from ...ui.overlay import lumi_disable_cursor_overlay_handler
-                lumi_disable_cursor_overlay_handler()
 
             # Reset positioning mode
             if hasattr(context.scene, 'light_props'):
@@ -366,19 +389,17 @@ class LUMI_OT_move_positioning(bpy.types.Operator, BaseModalOperator):
             else:
                 pass
 
-            # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            # Clear modal state and unregister like every other exit
+            self.cleanup(context)
 
             self._initial_positions = {}
             self.report({'INFO'}, "Move positioning cancelled - positions restored")
             return {'CANCELLED'}
 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            if bpy.app.debug:
+                traceback.print_exc()
+            self.cleanup(context)
             return {'CANCELLED'}
 
 
@@ -7,7 +7,6 @@ Normal Operations
 Operators for normal-based positioning and alignment of lights.
 """
 import bpy
-from bpy_extras import view3d_utils
 from mathutils import Vector
 from ...utils import lumi_is_addon_enabled, lumi_raycast_at_mouse
 from ...utils.light import lumi_get_light_pivot, lumi_set_light_pivot
@@ -17,9 +16,13 @@ from .utils import (
     lumi_handle_modal_error, 
     lumi_handle_positioning_error,
     detect_positioning_mode,
-    get_modifier_keys_for_mode
+    get_modifier_keys_for_mode,
+    lumi_get_view3d_areas,
+    lumi_tag_view3d_redraw,
+    InitialTransform
 )
 from ...core.state import get_state
+from ...ui.overlay import lumi_enable_cursor_overlay_handler, lumi_disable_cursor_overlay_handler
 from ...base_modal import BaseModalOperator
 
 class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
@@ -31,6 +34,13 @@ class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
     _dragging = False
     _initial_distances = {}
     _initial_positions = {}
+    _last_mouse = (-1, -1)
+    _last_ray_key = None
+    _last_cast_mouse = None
+    _v3d_areas = []
+    _lights = ()
+    _mouse_x = 0
+    _mouse_y = 0
 
     def __del__(self):
         """Clean up stored data when operator is destroyed"""
@@ -39,9 +49,6 @@ class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
             if hasattr(self, '_initial_distances'):
                 self._initial_distances.clear()
             if hasattr(self, '_initial_positions'):
-                for light_name in self._initial_positions:
-                    if 'pivot' in self._initial_positions[light_name]:
-                        self._initial_positions[light_name]['pivot'] = None
                 self._initial_positions.clear()
         except (ReferenceError, AttributeError):
             pass
@@ -67,22 +74,20 @@ class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
         
         # Get selected lights
         selected_lights = [l for l in context.selected_objects if l.type == 'LIGHT']
+        # Selection does not change mid-drag, reused by every update
+        self._lights = tuple(selected_lights)
         for light in selected_lights:
-            self._initial_positions[light.name] = {
-                'location': light.location.copy(),
-                'rotation_euler': light.rotation_euler.copy(),
-                'rotation_mode': light.rotation_mode,
-                'pivot': None
-            }
+            initial = InitialTransform(light)
+            self._initial_positions[light.name] = initial
             
             if "Lumi_pivot_world" in light:
                 try:
                     pivot = lumi_get_light_pivot(light)
-                    self._initial_positions[light.name]['pivot'] = (pivot.x, pivot.y, pivot.z)
+                    initial.pivot = (pivot.x, pivot.y, pivot.z)
                     self._initial_distances[light.name] = (light.location - pivot).length
                 except Exception as e:
-                    print(f"âŒ Error storing pivot for {light.name}: {e}")
-                    self._initial_positions[light.name]['pivot'] = None
+                    print(f"❌ Error storing pivot for {light.name}: {e}")
+                    initial.pivot = None
                     self._initial_distances[light.name] = scene_light_distance
             else:
                 self._initial_distances[light.name] = scene_light_distance
@@ -110,21 +115,28 @@ class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
             state.set_modal_state('align', True)
             scene.light_props.positioning_mode = 'NORMAL'
             
+            # Expose cursor position to the overlay through the operator instance
+            self._mouse_x = event.mouse_region_x
+            self._mouse_y = event.mouse_region_y
+            state.register_modal('align', self)
+            
             self._dragging = True
             self._start_mouse = (event.mouse_region_x, event.mouse_region_y)
+            self._last_mouse = (-1, -1)
+            self._last_ray_key = None
+            self._last_cast_mouse = None
             self.store_original_positions(context)
             
             context.window_manager.modal_handler_add(self)
             
+            # Viewports to redraw for the rest of the session
+            self._v3d_areas = lumi_get_view3d_areas(context)
+            
             # Enable overlay handler for positioning mode
-            from ...ui.overlay import lumi_enable_cursor_overlay_handler
             lumi_enable_cursor_overlay_handler()
             
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
             
             return {'RUNNING_MODAL'}
                 
@@ -136,6 +148,7 @@ class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
         
         try:
             if not self.validate_modal_context(context, event):
+                self.cleanup(context)
                 return {'CANCELLED'}
             
             detected_mode = detect_positioning_mode(event)
@@ -151,69 +164,104 @@ class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
             if event.type in {'WHEELUPMOUSE', 'WHEELDOWNMOUSE'} and event.shift:
                 return {'PASS_THROUGH'}
 
+            # Anything but a mouse move may have changed what lies under the cursor
+            if event.type != 'MOUSEMOVE':
+                self._last_ray_key = None
+
             if event.shift and not event.ctrl and not event.alt:
                 
                 if self._dragging and event.type == 'MOUSEMOVE' and event.shift:
                     mouse_pos = (event.mouse_region_x, event.mouse_region_y)
+                    # Same pixel as the last processed event, skip the scene raycast
+                    if mouse_pos == self._last_mouse:
+                        return {'RUNNING_MODAL'}
+                    self._last_mouse = mouse_pos
+                    self._mouse_x, self._mouse_y = mouse_pos
                     
-                    scene = context.scene
-                    scene.lumi_smart_mouse_x = event.mouse_region_x
-                    scene.lumi_smart_mouse_y = event.mouse_region_y
+                    # Overlay reads the cursor from this operator, only the active view needs it
+                    if context.area:
+                        context.area.tag_redraw()
                     
-                    hit_obj, hit_location, hit_normal, hit_index = lumi_raycast_at_mouse(context, mouse_pos)
-
-                    if hit_obj and hit_obj.type == 'MESH':
-                        scene = context.scene
-                        scene.light_target = hit_obj
-                        scene.light_target_face_location = (hit_location.x, hit_location.y, hit_location.z)
-                        
-                        direction = hit_normal.normalized()
-                        scene_light_distance = scene.light_distance
-                        hit_location_copy = hit_location[:]
-                        hit_normal_copy = hit_normal[:]
-                        hit_obj_name = hit_obj.name
-                        
-                        selected_lights = [l for l in context.selected_objects if l.type == 'LIGHT']
-                        for light in selected_lights:
-                            distance = self._initial_distances.get(light.name, scene_light_distance)
-                            light.location = hit_location + direction * distance
-                            rot_quat = direction.to_track_quat('Z', 'Y')
-                            light.rotation_euler = rot_quat.to_euler()
-                            lumi_set_light_pivot(light, hit_location)
-                            light["target_face_index"] = hit_index
-                            light["target_face_location"] = hit_location_copy
-                            light["target_face_normal"] = hit_normal_copy
-                            light["target_face_object"] = hit_obj_name
-                        self.report({'INFO'}, 'Normal positioning active - face highlighting enabled')
-                    else:
-                        self.report({'INFO'}, 'Normal positioning active - no mesh surface detected')
+                    # Jitter within a 2px cell under an unchanged view hits the same
+                    # surface, so the previous raycast and light placement still hold
+                    rv3d = context.region_data
+                    ray_key = (
+                        mouse_pos[0] // 2, mouse_pos[1] // 2,
+                        rv3d.view_matrix.copy() if rv3d else None
+                    )
+                    if ray_key == self._last_ray_key:
+                        return {'RUNNING_MODAL'}
+                    self._last_ray_key = ray_key
+                    
+                    self.update_normal_position(context, mouse_pos)
 
                     return {'RUNNING_MODAL'}
 
                 if self._dragging and event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
-                    self._dragging = False
-                    state = get_state()
-                    if state:
-                        state.set_modal_state('align', False)
-                    
-                    # Reset positioning mode for consistency with cancel
-                    if hasattr(context.scene, 'light_props'):
-                        context.scene.light_props.positioning_mode = 'DISABLE'
+                    # The 2px cell skip has no catch-up while dragging, land on the final cursor
+                    mouse_pos = (event.mouse_region_x, event.mouse_region_y)
+                    if self._last_cast_mouse is not None and mouse_pos != self._last_cast_mouse:
+                        self.update_normal_position(context, mouse_pos)
                     
+                    # End modal operation, cleanup also resets the positioning mode
                     self.cleanup(context)
                     self.report({'INFO'}, 'Normal positioning completed')
                     return {'FINISHED'}
 
             return {'PASS_THROUGH'}
         except Exception as e:
+            self.cleanup(context)
             return lumi_handle_modal_error(self, context, e, "Normal positioning")
 
+    def update_normal_position(self, context, mouse_pos):
+        """Raycast at mouse_pos and place every light along the normal of the hit face"""
+        self._last_cast_mouse = mouse_pos
+        
+        hit_obj, hit_location, hit_normal, hit_index = lumi_raycast_at_mouse(context, mouse_pos)
+
+        if hit_obj and hit_obj.type == 'MESH':
+            scene = context.scene
+            scene.light_target = hit_obj
+            scene.light_target_face_location = (hit_location.x, hit_location.y, hit_location.z)
+            
+            direction = hit_normal.normalized()
+            scene_light_distance = scene.light_distance
+            hit_location_copy = hit_location[:]
+            hit_normal_copy = hit_normal[:]
+            hit_obj_name = hit_obj.name
+            
+            # Orientation only depends on the surface normal, shared by all lights
+            rot_euler = direction.to_track_quat('Z', 'Y').to_euler()
+            
+            for light in self._lights:
+                distance = self._initial_distances.get(light.name, scene_light_distance)
+                light.location = hit_location + direction * distance
+                light.rotation_euler = rot_euler
+                lumi_set_light_pivot(light, hit_location)
+                # Index and object only change when the cursor crosses a face
+                if light.get("target_face_index") != hit_index:
+                    light["target_face_index"] = hit_index
+                light["target_face_location"] = hit_location_copy
+                light["target_face_normal"] = hit_normal_copy
+                if light.get("target_face_object") != hit_obj_name:
+                    light["target_face_object"] = hit_obj_name
+            self.report({'INFO'}, 'Normal positioning active - face highlighting enabled')
+        else:
+            self.report({'INFO'}, 'Normal positioning active - no mesh surface detected')
+
     def cleanup(self, context):
         """Clean up normal positioning state"""
         try:
             self._dragging = False
+            
+            # Every exit path ends here, so modal state and overlay never outlive the operator
             state = get_state()
             state.set_modal_state('align', False)
+            state.unregister_modal('align')
+            
+            # Disable overlay handler only if no smart control is active
+            if not state.scroll_control_enabled:
+                lumi_disable_cursor_overlay_handler()
             
             # Reset positioning mode
             if hasattr(context.scene, 'light_props'):
@@ -222,10 +270,7 @@ class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
                 pass
             
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
                         
             super().cleanup(context)
             
@@ -238,48 +283,19 @@ class LUMI_OT_normal_positioning(bpy.types.Operator, BaseModalOperator):
             self._dragging = False
             self._start_mouse = None
             
-            # Restore initial positions, rotations, and pivots for all selected lights
-            selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
-            for light in selected_lights:
-                if light.name in self._initial_positions:
-                    initial_data = self._initial_positions[light.name]
-                    # Restore position
-                    light.location = initial_data['location'].copy()
-                    # Restore rotation
-                    light.rotation_mode = initial_data['rotation_mode']
-                    light.rotation_euler = initial_data['rotation_euler'].copy()
-                    # Restore pivot if it was stored
-                    if initial_data['pivot'] is not None:
-                        light["Lumi_pivot_world"] = initial_data['pivot']
-                    else:
-                        # If no initial pivot stored, remove pivot
-                        if "Lumi_pivot_world" in light:
-                            del light["Lumi_pivot_world"]
+            # Restore initial positions, rotations, and pivots for the lights captured at drag start
+            for light in self._lights:
+                initial = self._initial_positions.get(light.name)
+                if initial is not None:
+                    initial.restore(light)
             
-            # Clean up state
-            state = get_state()
-            state.set_modal_state('align', False)
-            
-            # Disable overlay handler only if no smart control is active
-            if not state.scroll_control_enabled:
-                from ...ui.overlay import lumi_disable_cursor_overlay_handler
-                lumi_disable_cursor_overlay_handler()
-            
-            # Reset positioning mode
-            if hasattr(context.scene, 'light_props'):
-                context.scene.light_props.positioning_mode = 'DISABLE'
-            else:
-                pass
-            
-            # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            # Clear modal state, reset the mode and unregister like every other exit
+            self.cleanup(context)
                         
             self.report({'INFO'}, "Normal positioning cancelled - positions restored")
             return {'CANCELLED'}
         except Exception as e:
             lumi_handle_positioning_error(self, context, e, "Normal cancel")
+            self.cleanup(context)
             return {'CANCELLED'}
 
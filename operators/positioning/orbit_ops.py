@@ -8,9 +8,12 @@ Operators for orbital positioning and rotation of lights around targets.
 """
 
 import bpy
-from mathutils import Vector, Matrix
+from mathutils import Vector, Euler
 import math
-from ...utils import lumi_is_addon_enabled, lumi_update_light_orientation
+import time
+import traceback
+import numpy as np
+from ...utils import lumi_is_addon_enabled
 from ...utils.light import lumi_get_light_pivot
 from .utils import (
     lumi_disable_all_positioning_ops, 
@@ -18,11 +21,147 @@ from .utils import (
     lumi_handle_modal_error, 
     lumi_handle_positioning_error,
     detect_positioning_mode,
-    get_modifier_keys_for_mode
+    get_modifier_keys_for_mode,
+    lumi_tag_view3d_redraw,
+    InitialTransform
 )
 
 from ...core.state import get_state
 from ...base_modal import BaseModalOperator
+from ...ui.overlay import lumi_enable_cursor_overlay_handler, lumi_disable_cursor_overlay_handler
+
+# Numba is optional, Blender only ships NumPy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Slider callbacks closer together than this are coalesced into one update (seconds)
+REALTIME_UPDATE_INTERVAL = 0.016
+# Angle changes smaller than this are treated as no change (degrees, below the 0.1 slider step)
+ANGLE_EPSILON = 1e-4
+# Past this theta + |phi| (radians) mathutils to_euler() returns the flipped twin of (theta, 0, phi)
+FLIP_ANGLE_SUM = 1.5 * math.pi - 1e-4
+
+_last_realtime_update = 0.0
+# (azimuth, elevation) last applied by the popup. Module level like the timestamp above:
+# property update callbacks may receive the property group, not the invoked operator.
+_last_realtime_angles = None
+
+
+def _place_on_sphere_numpy(pivots, direction, radii, out):
+    """Write pivots + radii * direction into a preallocated (N, 3) array"""
+    np.multiply(radii[:, None], direction[None, :], out=out)
+    out += pivots
+
+
+def _place_on_sphere_loop(pivots, direction, radii, out):
+    """Scalar loop form of _place_on_sphere_numpy, compiled when Numba is installed"""
+    dx = direction[0]
+    dy = direction[1]
+    dz = direction[2]
+    for i in range(radii.shape[0]):
+        r = radii[i]
+        out[i, 0] = pivots[i, 0] + r * dx
+        out[i, 1] = pivots[i, 1] + r * dy
+        out[i, 2] = pivots[i, 2] + r * dz
+
+
+if NUMBA_AVAILABLE:
+    _place_on_sphere = njit(cache=True, fastmath=True)(_place_on_sphere_loop)
+else:
+    _place_on_sphere = _place_on_sphere_numpy
+
+
+def _orbit_locations(locations, pivots, azimuth, elevation, min_radius):
+    """Place lights at a shared azimuth/elevation around their pivots, keeping each distance
+    
+    Args:
+        locations: (N, 3) array of current light locations
+        pivots: (N, 3) array of pivots, one row per light
+        azimuth: Azimuth in degrees
+        elevation: Elevation in degrees
+        min_radius: Distances at or below this are replaced by 1.0
+    
+    Returns:
+        np.ndarray: (N, 3) new light locations
+    """
+    # The direction is the same for every light, only the radius differs
+    az = math.radians(azimuth)
+    el = math.radians(elevation)
+    cos_el = math.cos(el)
+    direction = np.array((cos_el * math.cos(az), cos_el * math.sin(az), math.sin(el)))
+    
+    radii = np.linalg.norm(locations - pivots, axis=1)
+    radii[radii <= min_radius] = 1.0
+    
+    new_locations = np.empty_like(pivots)
+    _place_on_sphere(pivots, direction, radii, new_locations)
+    return new_locations
+
+
+def _track_euler(direction):
+    """XYZ Euler pointing -Z along direction with Y up
+    
+    Gives the same solution as to_track_quat('-Z', 'Y').to_euler(), up to float32 rounding.
+    With rotation X by theta then Z by phi, -Z maps to
+    (-sin(phi) sin(theta), cos(phi) sin(theta), -cos(theta)), so both angles follow
+    directly from the direction without building a quaternion. mathutils returns the
+    flipped twin (theta - pi, pi, phi -+ pi) instead once theta + |phi| passes 1.5 pi,
+    so those aims, and vertical ones, go through mathutils.
+    """
+    dx, dy, dz = direction
+    horizontal = math.sqrt(dx * dx + dy * dy)
+    if horizontal >= 1e-6:
+        theta = math.atan2(horizontal, -dz)
+        phi = math.atan2(-dx, dy)
+        if theta + abs(phi) <= FLIP_ANGLE_SUM:
+            return Euler((theta, 0.0, phi), 'XYZ')
+    # Degenerate roll or flipped solution, let mathutils choose
+    return Vector(direction).to_track_quat('-Z', 'Y').to_euler()
+
+
+def _set_lights_spherical(lights, azimuth, elevation, scene, min_radius):
+    """Place lights at the given spherical angles around their pivots and aim them at it
+    
+    Shared by the orbit popup and the orbit angles operator. Lights without a stored
+    pivot orbit around the scene light target, or the origin when there is none.
+    
+    Args:
+        lights: Light objects to place
+        azimuth: Azimuth in degrees
+        elevation: Elevation in degrees
+        scene: Scene providing the fallback pivot
+        min_radius: Distances at or below this are replaced by 1.0
+    """
+    # Fallback pivot is shared by every light without its own
+    scene_target = getattr(scene, 'light_target', None)
+    fallback_pivot = scene_target.location[:] if scene_target else (0.0, 0.0, 0.0)
+    
+    # lumi_get_light_pivot handles malformed pivots itself, no per-light guard needed
+    pivot_array = np.array([
+        lumi_get_light_pivot(light)[:] if "Lumi_pivot_world" in light else fallback_pivot
+        for light in lights
+    ])
+    
+    # New positions for all lights in one pass, same spherical coordinates for each
+    new_locations = _orbit_locations(
+        np.array([light.location[:] for light in lights]), pivot_array,
+        azimuth, elevation, min_radius
+    )
+    # Aim directions from the batch, no RNA read back after the location write
+    aims = pivot_array - new_locations
+    
+    for light, new_location, aim in zip(lights, new_locations.tolist(), aims.tolist()):
+        # Orientation toward the resolved pivot, computed before touching RNA
+        rotation = _track_euler(aim) if aim[0] * aim[0] + aim[1] * aim[1] + aim[2] * aim[2] > 1e-6 else None
+        
+        # Set new position and orientation
+        light.location = new_location
+        if rotation is not None:
+            light.rotation_euler = rotation
+
 
 class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
     bl_idname = "lumi.orbit_positioning"
@@ -33,6 +172,8 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
     _timer = None
     _dragging = False
     _initial_positions = {}
+    _selected_lights = ()
+    _pivot_cache = {}
     
     azimuth: bpy.props.FloatProperty(
         name="Azimuth",
@@ -92,7 +233,6 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
             self._timer = context.window_manager.event_timer_add(0.1, window=context.window)
             
             # Enable overlay handler for positioning mode
-            from ...ui.overlay import lumi_enable_cursor_overlay_handler
             lumi_enable_cursor_overlay_handler()
             
             self._dragging = True
@@ -100,10 +240,7 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
             self.store_original_positions(context)
             
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context)
             
             return {'RUNNING_MODAL'}
                 
@@ -116,39 +253,8 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
             selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
             if not selected_lights:
                 return
-                
-            for light in selected_lights:
-                try:
-                    if "Lumi_pivot_world" in light:
-                        pivot = lumi_get_light_pivot(light)
-                    elif hasattr(context.scene, 'light_target') and context.scene.light_target:
-                        pivot = context.scene.light_target.location
-                    else:
-                        pivot = Vector((0.0, 0.0, 0.0))
-
-                    vec = light.location - pivot
-                    r = vec.length
-                    if r <= 0.0001:
-                        r = 1.0
-
-                    target_az = math.radians(self.azimuth)
-                    target_el = math.radians(self.elevation)
-
-                    x = r * math.cos(target_el) * math.cos(target_az)
-                    y = r * math.cos(target_el) * math.sin(target_az)
-                    z = r * math.sin(target_el)
-
-                    light.location = pivot + Vector((x, y, z))
-
-                    if "Lumi_pivot_world" in light:
-                        lumi_update_light_orientation(light)
-                    else:
-                        direction = (pivot - light.location)
-                        if direction.length > 0.001:
-                            direction = direction.normalized()
-                            light.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
-                except Exception:
-                    continue
+            
+            _set_lights_spherical(selected_lights, self.azimuth, self.elevation, context.scene, 0.0001)
         except Exception:
             pass
 
@@ -169,9 +275,10 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
                     pivot = Vector((0.0, 0.0, 0.0))
 
                 vec = first.location - pivot
-                if vec.length > 0.001:
+                if vec.length_squared > 1e-6:
                     az = math.degrees(math.atan2(vec.y, vec.x))
-                    el = math.degrees(math.atan2(vec.z, math.sqrt(vec.x * vec.x + vec.y * vec.y)))
+                    # asin of z over the radius, clamped against rounding drift
+                    el = math.degrees(math.asin(max(-1.0, min(1.0, vec.z / vec.length))))
                 else:
                     az = 0.0
                     el = 0.0
@@ -227,61 +334,78 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
         if self._dragging and event.type == 'MOUSEMOVE' and event.alt:
             # # Try to execute code with error handling
             try:
+                # Redundant MOUSEMOVE (no pixel delta) would rotate by zero, skip it
+                # together with the cursor props since nothing needs redrawing
+                if event.mouse_x == event.mouse_prev_x and event.mouse_y == event.mouse_prev_y:
+                    return {'RUNNING_MODAL'}
+                
                 scene = context.scene
                 scene.lumi_smart_mouse_x = event.mouse_region_x
                 scene.lumi_smart_mouse_y = event.mouse_region_y
                 
-                selected_objects = context.selected_objects
-                selected_lights = [obj for obj in selected_objects if obj.type == 'LIGHT']
+                selected_lights = self._selected_lights
+                pivot_cache = self._pivot_cache
                 
                 if selected_lights:
                     delta_x = (event.mouse_x - event.mouse_prev_x) * 0.01
                     delta_y = (event.mouse_y - event.mouse_prev_y) * 0.01
                     scene_light_target = scene.light_target
-                    z_vector = Vector((0, 0, 1))
+                    fallback_pivot = scene_light_target.location if scene_light_target else Vector((0, 0, 0))
+                    
+                    # Azimuth step is the same for every light, rotate in the XY plane
+                    cos_z = math.cos(delta_x)
+                    sin_z = math.sin(delta_x)
+                    # Elevation step is also shared, applied per light around its own axis
+                    cos_y = math.cos(delta_y)
+                    sin_y = math.sin(delta_y)
+                    one_minus_cos_y = 1.0 - cos_y
                     
                     for light in selected_lights:
-                        try:
-                            if "Lumi_pivot_world" in light:
-                                pivot = lumi_get_light_pivot(light)
-                            elif scene_light_target:
-                                pivot = scene_light_target.location
-                            else:
-                                pivot = Vector((0, 0, 0))
+                        pivot = pivot_cache.get(light.name, fallback_pivot)
                             
-                            offset = light.location - pivot
-                            offset = Matrix.Rotation(delta_x, 4, 'Z') @ offset
-
-                            # Handle Z-axis alignment issue when elevation = 0
-                            right_vector = offset.cross(z_vector)
-                            if right_vector.length > 0.001:
-                                right_vector.normalize()
-                                offset = Matrix.Rotation(delta_y, 4, right_vector) @ offset
-                            else:
-                                # When offset is parallel to Z-axis (elevation = Â±90Â°)
-                                # or when offset is zero (light at pivot), use X-axis as fallback
-                                # This prevents the "spinning in place" issue
-                                if abs(offset.z) > 0.001:  # Nearly vertical
-                                    # Use X-axis for elevation rotation when vertical
-                                    right_vector = Vector((1, 0, 0))
-                                    offset = Matrix.Rotation(delta_y, 4, right_vector) @ offset
-                                else:  # Nearly zero offset or horizontal
-                                    # For elevation = 0 case, use Y-axis for elevation rotation
-                                    right_vector = Vector((0, 1, 0))
-                                    offset = Matrix.Rotation(delta_y, 4, right_vector) @ offset
-
-                            light.location = pivot + offset
-
-                            if "Lumi_pivot_world" in light:
-                                lumi_update_light_orientation(light)
-                            else:
-                                direction = (pivot - light.location)
-                                if direction.length > 0.001:
-                                    direction = direction.normalized()
-                                    light.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
-                        except Exception as light_error:
-                            lumi_handle_positioning_error(self, context, light_error, f"Light {light.name} rotation")
-                            continue
+                        # Scalar offset from the pivot, no Vector per step
+                        px, py, pz = pivot
+                        lx, ly, lz = light.location
+                        ox = lx - px
+                        oy = ly - py
+                        oz = lz - pz
+                        ox, oy = cos_z * ox - sin_z * oy, sin_z * ox + cos_z * oy
+
+                        # Handle Z-axis alignment issue when elevation = 0
+                        # offset x (0, 0, 1) reduces to (oy, -ox, 0)
+                        right_length_sq = ox * ox + oy * oy
+                        if right_length_sq > 1e-6:
+                            right_length = math.sqrt(right_length_sq)
+                            kx, ky, kz = oy / right_length, -ox / right_length, 0.0
+                        else:
+                            # When offset is parallel to Z-axis (elevation = Â±90Â°)
+                            # or when offset is zero (light at pivot), use X-axis as fallback
+                            # This prevents the "spinning in place" issue
+                            if abs(oz) > 0.001:  # Nearly vertical
+                                # Use X-axis for elevation rotation when vertical
+                                kx, ky, kz = 1.0, 0.0, 0.0
+                            else:  # Nearly zero offset or horizontal
+                                # For elevation = 0 case, use Y-axis for elevation rotation
+                                kx, ky, kz = 0.0, 1.0, 0.0
+                            
+                        # Rodrigues: v cos + (k x v) sin + k (k . v)(1 - cos)
+                        k_dot = (kx * ox + ky * oy + kz * oz) * one_minus_cos_y
+                        ox, oy, oz = (
+                            ox * cos_y + (ky * oz - kz * oy) * sin_y + kx * k_dot,
+                            oy * cos_y + (kz * ox - kx * oz) * sin_y + ky * k_dot,
+                            oz * cos_y + (kx * oy - ky * ox) * sin_y + kz * k_dot,
+                        )
+
+                        # Aim back along the offset, computed before touching RNA so
+                        # the location just written is never read back
+                        if ox * ox + oy * oy + oz * oz > 1e-6:
+                            rotation = _track_euler((-ox, -oy, -oz))
+                        else:
+                            rotation = None
+                        
+                        light.location = (px + ox, py + oy, pz + oz)
+                        if rotation is not None:
+                            light.rotation_euler = rotation
                             
                 return {'RUNNING_MODAL'}
             except Exception as e:
@@ -300,7 +424,6 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
 
             # Disable overlay handler only if no smart control is active
             if not state.scroll_control_enabled:
-                from ...ui.overlay import lumi_disable_cursor_overlay_handler
                 lumi_disable_cursor_overlay_handler()
 
             self.cleanup(context)
@@ -317,24 +440,24 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
         """Store original positions and rotations of lights for cancel restore"""
         self._initial_positions = {}
         selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
+        # Selection and pivots stay fixed while orbiting, reused by every MOUSEMOVE
+        self._selected_lights = tuple(selected_lights)
+        self._pivot_cache = {}
         
         # Store initial positions, rotations, rotation modes, and pivots for all selected lights
         for light in selected_lights:
-            self._initial_positions[light.name] = {
-                'location': light.location.copy(),
-                'rotation_euler': light.rotation_euler.copy(),
-                'rotation_mode': light.rotation_mode,
-                'pivot': None  # Initialize pivot storage
-            }
+            initial = InitialTransform(light)
+            self._initial_positions[light.name] = initial
             
             # Store initial pivot position if it exists
             if "Lumi_pivot_world" in light:
                 try:
                     pivot = lumi_get_light_pivot(light)
-                    self._initial_positions[light.name]['pivot'] = (pivot.x, pivot.y, pivot.z)
+                    initial.pivot = pivot[:]
+                    self._pivot_cache[light.name] = pivot
                 except Exception as e:
-                    print(f"âŒ Error storing pivot for {light.name}: {e}")
-                    self._initial_positions[light.name]['pivot'] = None
+                    print(f"❌ Error storing pivot for {light.name}: {e}")
+                    initial.pivot = None
     
     def cancel(self, context):
         """Cancel orbit positioning and restore initial positions"""
@@ -342,23 +465,11 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
             self._dragging = False
             self._start_mouse = None
             
-            # Restore initial positions, rotations, and pivots for all selected lights
-            selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
-            for light in selected_lights:
-                if light.name in self._initial_positions:
-                    initial_data = self._initial_positions[light.name]
-                    # Restore position
-                    light.location = initial_data['location'].copy()
-                    # Restore rotation
-                    light.rotation_mode = initial_data['rotation_mode']
-                    light.rotation_euler = initial_data['rotation_euler'].copy()
-                    # Restore pivot if it was stored
-                    if initial_data['pivot'] is not None:
-                        light["Lumi_pivot_world"] = initial_data['pivot']
-                    else:
-                        # If no initial pivot stored, remove pivot
-                        if "Lumi_pivot_world" in light:
-                            del light["Lumi_pivot_world"]
+            # Restore the lights stored at invoke, selection may have changed since
+            for light in self._selected_lights:
+                initial = self._initial_positions.get(light.name)
+                if initial is not None:
+                    initial.restore(light)
             
             # Clean up state
             state = get_state()
@@ -366,7 +477,6 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
             
             # Disable overlay handler only if no smart control is active
             if not state.scroll_control_enabled:
-                from ...ui.overlay import lumi_disable_cursor_overlay_handler
                 lumi_disable_cursor_overlay_handler()
             
             # Reset positioning mode
@@ -376,16 +486,12 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
                 pass
             
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context)
                         
             self.report({'INFO'}, "Orbit positioning cancelled - positions restored")
             return {'CANCELLED'}
             
         except Exception as e:
-            import traceback
             traceback.print_exc()
             return {'CANCELLED'}
     
@@ -417,10 +523,7 @@ class LUMI_OT_orbit_positioning(bpy.types.Operator, BaseModalOperator):
             self._dragging = False
 
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context)
 
             super().cleanup(context)
 
@@ -437,67 +540,32 @@ class LUMI_OT_orbit_angles(bpy.types.Operator):
 
     def update_realtime(self, context):
         """Update light positions in real-time when slider values change"""
+        global _last_realtime_update, _last_realtime_angles
+        
+        # FloatProperty stores float32, compare with a tolerance rather than exactly
+        if (_last_realtime_angles is not None
+                and abs(self.azimuth - _last_realtime_angles[0]) < ANGLE_EPSILON
+                and abs(self.elevation - _last_realtime_angles[1]) < ANGLE_EPSILON):
+            return
+        
+        # A slider drag fires many callbacks per frame, one recompute per frame is enough.
+        # The popup re-runs execute() on every change, so the final value is still applied.
+        now = time.monotonic()
+        if now - _last_realtime_update < REALTIME_UPDATE_INTERVAL:
+            return
+        _last_realtime_update = now
+        _last_realtime_angles = (self.azimuth, self.elevation)
+        
         try:
             selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
             if not selected_lights:
                 return
 
-            for light in selected_lights:
-                try:
-                    # Get pivot point
-                    pivot = Vector((0.0, 0.0, 0.0))
-                    try:
-                        if "Lumi_pivot_world" in light:
-                            from ...utils.light import lumi_get_light_pivot
-                            pivot = lumi_get_light_pivot(light)
-                        elif hasattr(context.scene, 'light_target') and context.scene.light_target:
-                            pivot = context.scene.light_target.location.copy()
-                    except Exception:
-                        pass
-
-                    # Calculate distance from pivot
-                    vec = light.location - pivot
-                    r = vec.length
-                    if r <= 0.001:
-                        r = 1.0
-
-                    # Convert angles to radians and calculate new position
-                    target_az_rad = math.radians(self.azimuth)
-                    target_el_rad = math.radians(self.elevation)
-
-                    # Calculate new position using spherical coordinates
-                    x = r * math.cos(target_el_rad) * math.cos(target_az_rad)
-                    y = r * math.cos(target_el_rad) * math.sin(target_az_rad)
-                    z = r * math.sin(target_el_rad)
-
-                    # Set new position
-                    light.location = pivot + Vector((x, y, z))
-
-                    # Update light orientation
-                    try:
-                        from ...utils import lumi_update_light_orientation
-                        lumi_update_light_orientation(light)
-                    except Exception:
-                        # Fallback: manual orientation
-                        direction = (pivot - light.location)
-                        if direction.length > 0.001:
-                            direction = direction.normalized()
-                            light.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
-
-                    # Force update
-                    light.update_tag()
-                    
-                except Exception:
-                    continue
+            _set_lights_spherical(selected_lights, self.azimuth, self.elevation, context.scene, 0.001)
 
-            # Force scene update
-            context.view_layer.update()
-            
-            # Force viewport refresh
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            # No view_layer.update() per slider tick, the RNA writes already tag the
+            # lights for evaluation with the redraw; execute() does the full update once
+            lumi_tag_view3d_redraw(context)
                         
         except Exception:
             pass
@@ -529,6 +597,8 @@ class LUMI_OT_orbit_angles(bpy.types.Operator):
     )
 
     def invoke(self, context, event):
+        global _last_realtime_angles
+        
         selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
         if not selected_lights:
             return {'CANCELLED'}
@@ -537,7 +607,6 @@ class LUMI_OT_orbit_angles(bpy.types.Operator):
         # determine pivot
         try:
             if "Lumi_pivot_world" in first:
-                from ...utils.light import lumi_get_light_pivot
                 pivot = lumi_get_light_pivot(first)
             elif hasattr(context.scene, 'light_target') and context.scene.light_target:
                 pivot = context.scene.light_target.location
@@ -553,12 +622,15 @@ class LUMI_OT_orbit_angles(bpy.types.Operator):
             
         # Calculate azimuth and elevation with proper range clamping
         az = math.degrees(math.atan2(vec.y, vec.x))
-        el = math.degrees(math.atan2(vec.z, math.sqrt(vec.x * vec.x + vec.y * vec.y)))
+        # Radius is already known, elevation is asin(z / r), clamped against rounding drift
+        el = math.degrees(math.asin(max(-1.0, min(1.0, vec.z / r))))
         
         # Clamp values to property ranges
         az = max(-180.0, min(180.0, az))  # Clamp azimuth to [-180, 180]
         el = max(-90.0, min(90.0, el))    # Clamp elevation to [-90, 90]
         
+        # Seed the last-applied angles first so these assignments don't re-solve
+        _last_realtime_angles = (az, el)
         self.azimuth = az
         self.elevation = el
 
@@ -571,70 +643,15 @@ class LUMI_OT_orbit_angles(bpy.types.Operator):
             if not selected_lights:
                 return {'CANCELLED'}
 
-            success_count = 0
-            for light in selected_lights:
-                try:
-                    # Get pivot point
-                    pivot = Vector((0.0, 0.0, 0.0))
-                    try:
-                        if "Lumi_pivot_world" in light:
-                            from ...utils.light import lumi_get_light_pivot
-                            pivot = lumi_get_light_pivot(light)
-                        elif hasattr(context.scene, 'light_target') and context.scene.light_target:
-                            pivot = context.scene.light_target.location.copy()
-                    except Exception:
-                        pass  # use default pivot
-
-                    # Calculate distance from pivot
-                    vec = light.location - pivot
-                    r = vec.length
-                    if r <= 0.001:
-                        r = 1.0  # minimum distance
-
-                    # Convert angles to radians and calculate new position
-                    target_az_rad = math.radians(self.azimuth)
-                    target_el_rad = math.radians(self.elevation)
-
-                    # Calculate new position using spherical coordinates
-                    x = r * math.cos(target_el_rad) * math.cos(target_az_rad)
-                    y = r * math.cos(target_el_rad) * math.sin(target_az_rad)
-                    z = r * math.sin(target_el_rad)
-
-                    # Set new position
-                    new_location = pivot + Vector((x, y, z))
-                    light.location = new_location
-
-                    # Update light orientation to point toward pivot
-                    try:
-                        from ...utils import lumi_update_light_orientation
-                        lumi_update_light_orientation(light)
-                    except Exception:
-                        # Fallback: manual orientation
-                        direction = (pivot - light.location)
-                        if direction.length > 0.001:
-                            direction = direction.normalized()
-                            light.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
-
-                    # Force update
-                    light.update_tag()
-                    success_count += 1
-                    
-                except Exception:
-                    continue
+            _set_lights_spherical(selected_lights, self.azimuth, self.elevation, context.scene, 0.001)
 
             # Force scene update
             context.view_layer.update()
             
             # Force viewport refresh
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context)
 
-            if success_count > 0:
-                return {'FINISHED'}
-            else:
-                return {'CANCELLED'}
+            return {'FINISHED'}
                 
         except Exception:
             return {'CANCELLED'}
@@ -8,6 +8,10 @@ Operators for target-based positioning and alignment of lights.
 """
 
 import bpy
+import time
+import traceback
+from collections import OrderedDict
+import numpy as np
 from mathutils import Vector
 from bpy_extras import view3d_utils
 from ...utils import lumi_is_addon_enabled
@@ -18,12 +22,131 @@ from .utils import (
     lumi_handle_modal_error, 
     lumi_handle_positioning_error,
     detect_positioning_mode,
-    get_modifier_keys_for_mode
+    get_modifier_keys_for_mode,
+    lumi_get_view3d_areas,
+    lumi_tag_view3d_redraw,
+    lumi_world_bounds,
+    lumi_ray_hits_aabb,
+    InitialTransform
 )
 
 from ...core.state import get_state
+from ...ui.overlay import lumi_enable_cursor_overlay_handler, lumi_disable_cursor_overlay_handler
 from ...base_modal import BaseModalOperator
 
+# Numba is optional, Blender only ships NumPy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Releasing any of these ends the Ctrl+Alt drag unless both modifiers are still held
+MODIFIER_RELEASE_KEYS = frozenset({'LEFT_CTRL', 'RIGHT_CTRL', 'LEFT_ALT', 'RIGHT_ALT'})
+
+# Ctrl+wheel passes through to the viewport
+WHEEL_EVENT_TYPES = frozenset({'WHEELUPMOUSE', 'WHEELDOWNMOUSE'})
+
+# Below this many lights the per-light mathutils path beats NumPy setup cost
+BATCH_MIN_LIGHTS = 8
+
+# A raycast is issued once the cursor moved this far (squared pixels) or this long passed (seconds);
+# the modal timer issues the last skipped one when the cursor stops
+CAST_MIN_PIXELS_SQ = 4
+CAST_MIN_INTERVAL = 0.016
+
+# Raycast results kept per 2x2 pixel cell, oldest evicted first
+RAY_CACHE_SIZE = 32
+
+# Per-light result of the track kernels
+TRACK_SKIP = 0        # Light sits on the target, rotation is left alone
+TRACK_OK = 1          # Angles written to the output row
+TRACK_MATHUTILS = 2   # Left to mathutils: roll is degenerate, or it would pick the flipped solution
+
+# mathutils to_euler() returns whichever of (theta, 0, phi) and its flipped twin
+# (theta - pi, pi, phi -+ pi) has the smaller sum of absolute angles. The twin wins once
+# theta + |phi| passes 1.5 pi; rows near that edge go to mathutils so it makes the call.
+FLIP_ANGLE_SUM = 1.5 * np.pi - 1e-4
+
+
+def _track_angles_numpy(locations, target, out, status):
+    """Aim angles for every light at once, fills out (N, 3) and status (N,)
+    
+    With rotation X by theta then Z by phi, -Z maps to
+    (-sin(phi) sin(theta), cos(phi) sin(theta), -cos(theta)), so both angles come
+    from arctan2 without building a quaternion per light.
+    """
+    directions = target - locations
+    lengths_sq = np.einsum('ij,ij->i', directions, directions)
+    horizontal_sq = directions[:, 0] * directions[:, 0] + directions[:, 1] * directions[:, 1]
+    out[:, 0] = np.arctan2(np.sqrt(horizontal_sq), -directions[:, 2])
+    out[:, 1] = 0.0
+    out[:, 2] = np.arctan2(-directions[:, 0], directions[:, 1])
+    status[:] = TRACK_OK
+    status[out[:, 0] + np.abs(out[:, 2]) > FLIP_ANGLE_SUM] = TRACK_MATHUTILS
+    status[horizontal_sq <= 1e-12 * lengths_sq] = TRACK_MATHUTILS
+    status[lengths_sq <= 1e-6] = TRACK_SKIP
+
+
+def _track_angles_loop(locations, target, out, status):
+    """Scalar loop form of _track_angles_numpy, compiled when Numba is installed"""
+    for i in range(locations.shape[0]):
+        dx = target[0] - locations[i, 0]
+        dy = target[1] - locations[i, 1]
+        dz = target[2] - locations[i, 2]
+        horizontal_sq = dx * dx + dy * dy
+        length_sq = horizontal_sq + dz * dz
+        theta = np.arctan2(np.sqrt(horizontal_sq), -dz)
+        phi = np.arctan2(-dx, dy)
+        out[i, 0] = theta
+        out[i, 1] = 0.0
+        out[i, 2] = phi
+        if length_sq <= 1e-6:
+            status[i] = TRACK_SKIP
+        elif horizontal_sq <= 1e-12 * length_sq or theta + abs(phi) > FLIP_ANGLE_SUM:
+            status[i] = TRACK_MATHUTILS
+        else:
+            status[i] = TRACK_OK
+
+
+if NUMBA_AVAILABLE:
+    _track_angles = njit(cache=True, fastmath=True)(_track_angles_loop)
+else:
+    _track_angles = _track_angles_numpy
+
+
+def _track_eulers(locations, target):
+    """XYZ Euler per location aiming -Z at target with Y up, for many lights at once
+    
+    Gives the same solution as to_track_quat('-Z', 'Y').to_euler('XYZ'), up to float32
+    rounding: rows where mathutils would return the flipped twin, or pick the roll of a
+    vertical aim, are handed to mathutils itself.
+    
+    Args:
+        locations: (N, 3) array of light locations
+        target: World-space point the lights aim at
+    
+    Returns:
+        list: XYZ Euler per light, None for lights sitting on the target
+    """
+    target = np.asarray(target, dtype=np.float64)
+    angles = np.empty_like(locations)
+    status = np.empty(locations.shape[0], dtype=np.int8)
+    _track_angles(locations, target, angles, status)
+    
+    eulers = []
+    for index, (code, euler) in enumerate(zip(status.tolist(), angles.tolist())):
+        if code == TRACK_OK:
+            eulers.append(euler)
+        elif code == TRACK_MATHUTILS:
+            # Same call as the per-light path below BATCH_MIN_LIGHTS
+            direction = Vector(target - locations[index])
+            eulers.append(direction.to_track_quat('-Z', 'Y').to_euler('XYZ'))
+        else:
+            eulers.append(None)
+    return eulers
+
+
 class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
     bl_idname = "lumi.target_positioning"
     bl_label = "Target Positioning"
@@ -33,7 +156,21 @@ class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
     _start_mouse = None
     _pivot_data = {}
     _timer = None
-    _initial_positions = {}
+    _initial_transforms = ()
+    _light_locations = None
+    _light_location_vectors = ()
+    _region = None
+    _rv3d = None
+    _depsgraph = None
+    _scene = None
+    _lights = ()
+    _last_cast_xy = None
+    _last_cast_time = 0.0
+    _cast_pending = False
+    _ray_cache = None
+    _ray_cache_view = None
+    _world_bounds = None
+    _v3d_areas = []
 
     @classmethod    
     def poll(cls, context):
@@ -70,19 +207,30 @@ class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
             context.window_manager.modal_handler_add(self)
             self._timer = context.window_manager.event_timer_add(0.1, window=context.window)
             
+            # Viewports to redraw for the rest of the session
+            self._v3d_areas = lumi_get_view3d_areas(context)
+            
             # Enable overlay handler for positioning mode
-            from ...ui.overlay import lumi_enable_cursor_overlay_handler
             lumi_enable_cursor_overlay_handler()
             
+            # View and scene data stay the same for the whole drag, reused by every raycast
+            self._region = context.region
+            self._rv3d = context.region_data
+            self._depsgraph = context.view_layer.depsgraph
+            self._scene = scene
+            # Scene geometry doesn't move during the drag, only the lights are written
+            self._world_bounds = lumi_world_bounds(context)
+            
             self._dragging = True
             self._start_mouse = (event.mouse_region_x, event.mouse_region_y)
+            self._last_cast_xy = None
+            self._cast_pending = False
+            self._ray_cache = OrderedDict()
+            self._ray_cache_view = None
             self.store_initial_positions(context)
             
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
             
             return {'RUNNING_MODAL'}
                 
@@ -96,37 +244,55 @@ class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
                 self.cleanup(context)
                 return {'CANCELLED'}
 
+            # validate_modal_context already covers the addon and TARGET mode checks
             scene = context.scene
-            if not lumi_is_addon_enabled() or scene.light_props.positioning_mode != 'TARGET':
-                self._dragging = False
-                self.cleanup(context)
-                return {'CANCELLED'}
 
-            context.area.tag_redraw()
+            # Event fields read once, every branch below tests them
+            event_type = event.type
+            event_value = event.value
+            ctrl = event.ctrl
+            alt = event.alt
 
-            if event.type == 'RIGHTMOUSE':
+            if event_type == 'RIGHTMOUSE':
                 return self.cancel(context)
 
-            if event.type in {'WHEELUPMOUSE', 'WHEELDOWNMOUSE'} and event.ctrl:
+            if event_type in WHEEL_EVENT_TYPES and ctrl:
                 return {'PASS_THROUGH'}
             
-            if event.type == 'LEFTMOUSE' and event.value == 'PRESS':
+            if event_type == 'LEFTMOUSE' and event_value == 'PRESS':
                 if not self._dragging:
                     self._dragging = True
                 return {'RUNNING_MODAL'}
 
-            if self._dragging and event.type == 'MOUSEMOVE' and event.ctrl and event.alt:
+            if self._dragging and event_type == 'MOUSEMOVE' and ctrl and alt:
                 self._mouse_x = event.mouse_region_x
                 self._mouse_y = event.mouse_region_y
                 
-                scene = context.scene
                 scene.lumi_smart_mouse_x = event.mouse_region_x
                 scene.lumi_smart_mouse_y = event.mouse_region_y
                 
-                self.update_target_position(context)
+                # Sub-pixel jitter within a frame doesn't need a new scene raycast
+                now = time.perf_counter()
+                last_xy = self._last_cast_xy
+                if last_xy is not None and now - self._last_cast_time < CAST_MIN_INTERVAL:
+                    dx = self._mouse_x - last_xy[0]
+                    dy = self._mouse_y - last_xy[1]
+                    if dx * dx + dy * dy < CAST_MIN_PIXELS_SQ:
+                        self._cast_pending = True
+                        return {'RUNNING_MODAL'}
+                
+                self.cast_target_position(context, now)
                 return {'RUNNING_MODAL'}
 
-            if self._dragging and event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
+            # Catch up on a skipped raycast once the cursor rests
+            if self._dragging and event_type == 'TIMER' and self._cast_pending:
+                self.cast_target_position(context, time.perf_counter())
+                return {'RUNNING_MODAL'}
+
+            if self._dragging and event_type == 'LEFTMOUSE' and event_value == 'RELEASE':
+                # A throttled cast still holds the final cursor, apply it before finishing
+                if self._cast_pending:
+                    self.cast_target_position(context, time.perf_counter())
                 self._dragging = False
                 state = get_state()
                 if state:
@@ -138,15 +304,14 @@ class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
 
                 # Disable overlay handler only if no smart control is active
                 if not state.scroll_control_enabled:
-                    from ...ui.overlay import lumi_disable_cursor_overlay_handler
                     lumi_disable_cursor_overlay_handler()
 
                 self.cleanup(context)
                 self.report({'INFO'}, 'Target positioning completed')
                 return {'FINISHED'}
 
-            if (event.type == 'LEFTCTRL' or event.type == 'RIGHTCTRL' or event.type == 'LEFTALT' or event.type == 'RIGHTALT') and event.value == 'RELEASE':
-                if not (event.ctrl and event.alt):
+            if event_type in MODIFIER_RELEASE_KEYS and event_value == 'RELEASE':
+                if not (ctrl and alt):
                     return self.cancel(context)
 
             return {'PASS_THROUGH'}
@@ -160,22 +325,16 @@ class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
         try:
             self._dragging = False
             self._start_mouse = None
-            selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
-            for light in selected_lights:
-                if light.name in self._initial_positions:
-                    initial_data = self._initial_positions[light.name]
-                    light.location = initial_data['location'].copy()
-                    light.rotation_mode = initial_data['rotation_mode']
-                    light.rotation_euler = initial_data['rotation_euler'].copy()
-                    if initial_data.get('pivot') is not None:
-                        light["Lumi_pivot_world"] = initial_data['pivot']
+            # Snapshots are parallel to _lights, no lookup by name. Target cancel has always
+            # kept pivots the drag set on lights that had none, only stored ones are restored.
+            for light, initial in zip(self._lights, self._initial_transforms):
+                initial.restore(light, drop_new_pivot=False)
             
             state = get_state()
             state.set_modal_state('target', False)
             
             # Disable overlay handler only if no smart control is active
             if not state.scroll_control_enabled:
-                from ...ui.overlay import lumi_disable_cursor_overlay_handler
                 lumi_disable_cursor_overlay_handler()
             
             # Reset positioning mode
@@ -183,50 +342,85 @@ class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
                 context.scene.light_props.positioning_mode = 'DISABLE'
             
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
                         
             self.report({'INFO'}, "Target positioning cancelled - positions restored")
             return {'CANCELLED'}
             
         except Exception as e:
-            import traceback
             traceback.print_exc()
             return {'CANCELLED'}
 
+    def cast_target_position(self, context, now):
+        """Run update_target_position for the current cursor and record it as the last cast"""
+        self._last_cast_xy = (self._mouse_x, self._mouse_y)
+        self._last_cast_time = now
+        self._cast_pending = False
+        self.update_target_position(context)
+        
+        # Only the active view follows the cursor, and only when something was recomputed
+        if context.area:
+            context.area.tag_redraw()
+
     def update_target_position(self, context):
         # # Try to execute code with error handling
         try:
-            region = context.region
-            rv3d = context.region_data
-            coord = Vector((self._mouse_x, self._mouse_y))
-
-            view_vector = view3d_utils.region_2d_to_vector_3d(region, rv3d, coord)
-            ray_origin = view3d_utils.region_2d_to_origin_3d(region, rv3d, coord)
-
-            scene = context.scene
-            depsgraph = context.view_layer.depsgraph
-            hit, location, normal, *_ = scene.ray_cast(depsgraph, ray_origin, view_vector)
+            # Nearby pixels during a slow drag land on the same surface point, but only under
+            # the view they were cast in. Orbit, pan, zoom, NDOF and numpad views all pass
+            # through the modal, so compare the projection instead of watching events.
+            ray_cache = self._ray_cache
+            view = self._rv3d.perspective_matrix
+            if view != self._ray_cache_view:
+                ray_cache.clear()
+                self._ray_cache_view = view.copy()
+            key = (self._mouse_x >> 1, self._mouse_y >> 1)
+            cached = ray_cache.get(key)
+            if cached is not None:
+                hit, location = cached
+            else:
+                region = self._region
+                rv3d = self._rv3d
+                coord = (self._mouse_x, self._mouse_y)
+
+                view_vector = view3d_utils.region_2d_to_vector_3d(region, rv3d, coord)
+                ray_origin = view3d_utils.region_2d_to_origin_3d(region, rv3d, coord)
+
+                # Rays over empty background miss the scene bounds, skip the full raycast
+                bounds = self._world_bounds
+                if bounds is None or lumi_ray_hits_aabb(ray_origin, view_vector, bounds):
+                    hit, location, normal, *_ = self._scene.ray_cast(self._depsgraph, ray_origin, view_vector)
+                else:
+                    hit, location = False, None
+                
+                ray_cache[key] = (hit, location)
+                if len(ray_cache) > RAY_CACHE_SIZE:
+                    ray_cache.popitem(last=False)
 
             if hit:
-                # # Get selected objects in scene
-                selected_objects = context.selected_objects
-                for light in selected_objects:
-                    if light.type != 'LIGHT':
-                        continue
-
+                lights = self._lights
+                # Many lights: all orientations in one NumPy pass before the RNA writes
+                rotations = None
+                if len(lights) >= BATCH_MIN_LIGHTS:
+                    rotations = _track_eulers(self._light_locations, location)
+                
+                light_locations = self._light_location_vectors
+                for index, light in enumerate(lights):
                     # # Try to execute code with error handling
                     try:
                         lumi_set_light_pivot(light, location)
 
-                        direction_vector = location - light.location
-                        if direction_vector.length > 0.001:
-                            to_pivot = direction_vector.normalized()
-                            rot_quat = to_pivot.to_track_quat('-Z', 'Y')
+                        if rotations is not None:
+                            rot_euler = rotations[index]
+                        else:
+                            rot_euler = None
+                            direction_vector = location - light_locations[index]
+                            if direction_vector.length > 0.001:
+                                to_pivot = direction_vector.normalized()
+                                rot_euler = to_pivot.to_track_quat('-Z', 'Y').to_euler('XYZ')
+                        
+                        if rot_euler is not None:
                             light.rotation_mode = 'XYZ'
-                            light.rotation_euler = rot_quat.to_euler('XYZ')
+                            light.rotation_euler = rot_euler
                     except Exception as light_error:
                         lumi_handle_positioning_error(self, context, light_error, f"Light {light.name} target")
                         continue
@@ -247,12 +441,11 @@ class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
 
             state.set_modal_state('target', False)
             self._dragging = False
+            self._ray_cache = None
+            self._ray_cache_view = None
 
             # Redraw UI
-            for window in context.window_manager.windows:
-                for area in window.screen.areas:
-                    if area.type == 'VIEW_3D':
-                        area.tag_redraw()
+            lumi_tag_view3d_redraw(context, self._v3d_areas)
 
             super().cleanup(context)
 
@@ -261,21 +454,22 @@ class LUMI_OT_target_positioning(bpy.types.Operator, BaseModalOperator):
     
     def store_initial_positions(self, context):
         """Store initial positions, rotations, and rotation modes of lights for cancel restore"""
-        self._initial_positions = {}
         selected_lights = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
+        # Selection doesn't change during the drag, filtered once for update and cancel
+        self._lights = tuple(selected_lights)
+        
+        initial_transforms = []
         for light in selected_lights:
-            self._initial_positions[light.name] = {
-                'location': light.location.copy(),
-                'rotation_euler': light.rotation_euler.copy(),
-                'rotation_mode': light.rotation_mode,
-                'pivot': None
-            }
-            
+            initial = InitialTransform(light)
             if "Lumi_pivot_world" in light:
                 try:
-                    pivot = lumi_get_light_pivot(light)
-                    self._initial_positions[light.name]['pivot'] = (pivot.x, pivot.y, pivot.z)
+                    initial.pivot = lumi_get_light_pivot(light)[:]
                 except Exception as e:
-                    print(f"âŒ Error storing pivot for {light.name}: {e}")
-                    self._initial_positions[light.name]['pivot'] = None
-
+                    print(f"❌ Error storing pivot for {light.name}: {e}")
+                    initial.pivot = None
+            initial_transforms.append(initial)
+        self._initial_transforms = tuple(initial_transforms)
+        
+        # Target mode only rotates lights and moves pivots, locations are read once per drag
+        self._light_locations = np.array([initial.location for initial in initial_transforms], dtype=np.float64).reshape(-1, 3)
+        self._light_location_vectors = tuple(Vector(initial.location) for initial in initial_transforms)
@@ -8,7 +8,9 @@ Contains specialized utilities only used within positioning operators.
 """
 
 import bpy
+import numpy as np
 from mathutils import Vector
+from mathutils.bvhtree import BVHTree
 
 # Import state management
 from ...core.state import get_state
@@ -79,6 +81,347 @@ def validate_positioning_target(obj: bpy.types.Object) -> bool:
         return False
 
 
+def lumi_get_view3d_areas(context: bpy.types.Context) -> list:
+    """Collect the 3D viewports a positioning modal should redraw
+    
+    The cursor overlay only draws in the active window, so the active VIEW_3D
+    area is used when there is one, then the active window's 3D viewports.
+    The full window/area walk is the last resort when no window is in context.
+    
+    Args:
+        context: Blender context
+    
+    Returns:
+        list: VIEW_3D areas
+    """
+    area = context.area
+    if area and area.type == 'VIEW_3D':
+        return [area]
+    
+    window = context.window
+    if window:
+        return [area for area in window.screen.areas if area.type == 'VIEW_3D']
+    
+    window_manager = context.window_manager
+    return [
+        area
+        for window in window_manager.windows
+        for area in window.screen.areas
+        if area.type == 'VIEW_3D'
+    ]
+
+
+def lumi_tag_view3d_redraw(context: bpy.types.Context, areas: list = None) -> None:
+    """Tag 3D viewports for redraw
+    
+    Args:
+        context: Blender context
+        areas: Areas cached with lumi_get_view3d_areas, collected on demand if omitted
+    """
+    if areas is None:
+        areas = lumi_get_view3d_areas(context)
+    
+    for area in areas:
+        try:
+            area.tag_redraw()
+        except ReferenceError:
+            # Area was closed since it was cached
+            pass
+
+
+# Object types that evaluate to raycastable geometry
+RAYCAST_OBJECT_TYPES = {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT'}
+
+
+def lumi_scene_has_instances(context: bpy.types.Context) -> bool:
+    """Check whether visible objects generate instanced geometry
+    
+    Collection and particle instancers, and geometry nodes that may output instances,
+    produce surfaces that scene.ray_cast hits but per-object BVHs and bound boxes miss.
+    
+    Args:
+        context: Blender context
+    
+    Returns:
+        bool: True if the scene has to be raycast as a whole
+    """
+    for obj in context.visible_objects:
+        if obj.is_instancer:
+            return True
+        if obj.type == 'MESH' and len(obj.particle_systems):
+            return True
+        if any(modifier.type == 'NODES' for modifier in obj.modifiers):
+            return True
+    return False
+
+
+def lumi_build_bvh_cache(context: bpy.types.Context) -> list:
+    """Build BVH trees for all visible geometry once per modal session
+    
+    Args:
+        context: Blender context
+    
+    Returns:
+        list: (object, bvh, matrix_world, matrix_world_inverted, direction_matrix, normal_matrix) tuples,
+        or None when the scene has instanced geometry and must go through scene.ray_cast
+    """
+    if lumi_scene_has_instances(context):
+        return None
+    
+    depsgraph = context.evaluated_depsgraph_get()
+    bvh_cache = []
+    
+    for obj in context.visible_objects:
+        if obj.type not in RAYCAST_OBJECT_TYPES:
+            continue
+        try:
+            bvh = BVHTree.FromObject(obj, depsgraph)
+        except (ValueError, RuntimeError):
+            # Object has no evaluable geometry
+            continue
+        matrix = obj.matrix_world.copy()
+        matrix_inv = matrix.inverted_safe()
+        # Per-ray transforms are fixed for the session, precompute them here
+        direction_matrix = matrix_inv.to_3x3()
+        normal_matrix = direction_matrix.transposed()
+        bvh_cache.append((obj, bvh, matrix, matrix_inv, direction_matrix, normal_matrix))
+    
+    return bvh_cache
+
+
+# Pad world bounds slightly so hits exactly on the outer faces are not culled by rounding
+_BOUNDS_PADDING = 1e-4
+
+
+def lumi_build_cache_bounds(bvh_cache: list) -> np.ndarray:
+    """World-space AABBs of a BVH cache, used to skip and order the per-mesh raycasts
+    
+    Args:
+        bvh_cache: Cache built by lumi_build_bvh_cache
+    
+    Returns:
+        np.ndarray: (N, 2, 3) array holding the (min, max) corners of cache entry i,
+        or None when the cache is empty
+    """
+    if not bvh_cache:
+        return None
+    
+    corner_blocks = []
+    for obj, _bvh, matrix, *_ in bvh_cache:
+        world = np.array(matrix)
+        corners = np.array([corner[:] for corner in obj.bound_box])
+        corner_blocks.append(corners @ world[:3, :3].T + world[:3, 3])
+    
+    corners = np.array(corner_blocks, dtype=np.float64)
+    return np.stack((corners.min(axis=1), corners.max(axis=1)), axis=1)
+
+
+def _ray_aabb_entries(aabbs: np.ndarray, origin: Vector, direction: Vector) -> tuple:
+    """Vectorised slab test, returning (indices, entry distances) of pierced boxes nearest first"""
+    point = np.asarray(origin, dtype=np.float64)
+    axis_direction = np.asarray(direction, dtype=np.float64)
+    lo = aabbs[:, 0]
+    hi = aabbs[:, 1]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1.0 / axis_direction
+        t0 = (lo - point) * inv
+        t1 = (hi - point) * inv
+    t_min = np.minimum(t0, t1)
+    t_max = np.maximum(t0, t1)
+    
+    parallel = axis_direction == 0.0
+    if parallel.any():
+        # Parallel to a slab, the ray must already lie between its planes
+        between = (lo <= point) & (point <= hi)
+        t_min = np.where(parallel, np.where(between, -np.inf, np.inf), t_min)
+        t_max = np.where(parallel, np.where(between, np.inf, -np.inf), t_max)
+    
+    t_near = np.maximum(t_min.max(axis=1), 0.0)
+    t_far = t_max.min(axis=1)
+    # Inclusive so flat boxes and coplanar or touching faces are all kept
+    indices = np.flatnonzero(t_near <= t_far)
+    order = np.argsort(t_near[indices], kind='stable')
+    indices = indices[order]
+    return indices.tolist(), t_near[indices].tolist()
+
+
+def _cast_cache_entry(entry: tuple, origin: Vector, direction: Vector, best_distance: float) -> tuple:
+    """Cast one BVH cache entry, returning (world_distance, location, normal) or None"""
+    obj, bvh, matrix, matrix_inv, direction_matrix, normal_matrix = entry
+    local_origin = matrix_inv @ origin
+    local_direction = direction_matrix @ direction
+    # Nothing past the current best can win; BVH distances are in local units
+    if best_distance == float('inf'):
+        location, normal, face_index, distance = bvh.ray_cast(local_origin, local_direction)
+    else:
+        local_limit = best_distance * local_direction.length / direction.length
+        location, normal, face_index, distance = bvh.ray_cast(local_origin, local_direction, local_limit)
+    if location is None:
+        return None
+    
+    # Compare in world space, local distances are scaled per object
+    world_location = matrix @ location
+    return (world_location - origin).length, world_location, (normal_matrix @ normal).normalized()
+
+
+def lumi_bvh_ray_cast(bvh_cache: list, origin: Vector, direction: Vector, bounds: np.ndarray = None,
+                      max_distance: float = None) -> tuple:
+    """Cast a world-space ray against a BVH cache, keeping the nearest hit
+    
+    Args:
+        bvh_cache: Cache built by lumi_build_bvh_cache
+        origin: Ray origin in world space
+        direction: Ray direction in world space
+        bounds: Optional result of lumi_build_cache_bounds, restricts the per-mesh
+            raycasts to objects whose AABB the ray pierces, nearest first
+        max_distance: Optional world-space ray length, geometry beyond it is ignored
+    
+    Returns:
+        tuple: (hit, location, normal, object) in world space, mirroring scene.ray_cast
+    """
+    best_location = None
+    best_normal = None
+    best_object = None
+    best_distance = float('inf') if max_distance is None else max_distance
+    
+    if bounds is None:
+        for entry in bvh_cache:
+            result = _cast_cache_entry(entry, origin, direction, best_distance)
+            if result is not None and result[0] < best_distance:
+                best_distance, best_location, best_normal = result
+                best_object = entry[0]
+    else:
+        # Slab-test every box at once; the t_near order lets the scan stop at the first box
+        # entered beyond the confirmed hit, coplanar boxes all come back together
+        direction = direction.normalized()
+        for index, entry_distance in zip(*_ray_aabb_entries(bounds, origin, direction)):
+            if entry_distance > best_distance:
+                break
+            entry = bvh_cache[index]
+            result = _cast_cache_entry(entry, origin, direction, best_distance)
+            if result is not None and result[0] < best_distance:
+                best_distance, best_location, best_normal = result
+                best_object = entry[0]
+    
+    if best_location is None:
+        return False, Vector((0.0, 0.0, 0.0)), Vector((0.0, 0.0, 0.0)), None
+    return True, best_location, best_normal, best_object
+
+
+def lumi_world_bounds(context: bpy.types.Context) -> tuple:
+    """World-space AABB enclosing every visible raycastable object
+    
+    Args:
+        context: Blender context
+    
+    Returns:
+        tuple: (min, max) corner tuples, or None when the scene cannot be bounded
+        this way (nothing raycastable, or instanced geometry outside object bounds)
+    """
+    # Instanced geometry is hit by scene.ray_cast but not covered by any bound_box
+    if lumi_scene_has_instances(context):
+        return None
+    
+    corner_blocks = []
+    for obj in context.visible_objects:
+        if obj.type not in RAYCAST_OBJECT_TYPES:
+            continue
+        matrix = np.array(obj.matrix_world)
+        corners = np.array([corner[:] for corner in obj.bound_box])
+        corner_blocks.append(corners @ matrix[:3, :3].T + matrix[:3, 3])
+    
+    if not corner_blocks:
+        return None
+    corners = np.concatenate(corner_blocks)
+    return tuple((corners.min(axis=0) - _BOUNDS_PADDING).tolist()), tuple((corners.max(axis=0) + _BOUNDS_PADDING).tolist())
+
+
+def lumi_ray_hits_aabb(origin: Vector, direction: Vector, bounds: tuple) -> bool:
+    """Slab test of a ray starting at origin against an AABB from lumi_world_bounds"""
+    lo, hi = bounds
+    t_near = 0.0
+    t_far = float('inf')
+    for axis in range(3):
+        o = origin[axis]
+        d = direction[axis]
+        if d == 0.0:
+            # Parallel to this slab, must already lie between its planes
+            if o < lo[axis] or o > hi[axis]:
+                return False
+            continue
+        inv = 1.0 / d
+        t0 = (lo[axis] - o) * inv
+        t1 = (hi[axis] - o) * inv
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > t_near:
+            t_near = t0
+        if t1 < t_far:
+            t_far = t1
+        if t_near > t_far:
+            return False
+    return True
+
+
+def lumi_scene_ray_cast(context: bpy.types.Context, bvh_cache: list, origin: Vector, direction: Vector,
+                        bounds: np.ndarray = None, max_distance: float = None) -> tuple:
+    """Cast against a BVH cache, or against the scene when the cache is None
+    
+    Args:
+        context: Blender context, used for the scene fallback
+        bvh_cache: Cache built by lumi_build_bvh_cache
+        origin: Ray origin in world space
+        direction: Ray direction in world space
+        bounds: Optional result of lumi_build_cache_bounds
+        max_distance: Optional world-space ray length
+    
+    Returns:
+        tuple: (hit, location, normal, object) in world space
+    """
+    if bvh_cache is not None:
+        return lumi_bvh_ray_cast(bvh_cache, origin, direction, bounds, max_distance)
+    
+    depsgraph = context.evaluated_depsgraph_get()
+    if max_distance is None:
+        hit, location, normal, _index, obj, _matrix = context.scene.ray_cast(depsgraph, origin, direction)
+    else:
+        hit, location, normal, _index, obj, _matrix = context.scene.ray_cast(
+            depsgraph, origin, direction, distance=max_distance
+        )
+    return hit, location, normal, obj
+
+
+class InitialTransform:
+    """Light transform captured when a positioning drag starts, restored on cancel"""
+    __slots__ = ('location', 'rotation_euler', 'rotation_mode', 'pivot')
+
+    def __init__(self, light: bpy.types.Object):
+        # Plain float tuples, no Vector/Euler kept alive for the whole drag
+        self.location = light.location[:]
+        self.rotation_euler = light.rotation_euler[:]
+        self.rotation_mode = light.rotation_mode
+        # World pivot as a plain tuple, None if the light had none
+        self.pivot = None
+
+    def restore(self, light: bpy.types.Object, drop_new_pivot: bool = True) -> None:
+        """Write the captured transform and pivot back to the light
+        
+        Args:
+            light: Light the snapshot was taken from
+            drop_new_pivot: Remove a pivot the drag created on a light that had none
+        """
+        # RNA assignment converts the tuples, mode goes first so the angles keep its order
+        light.location = self.location
+        light.rotation_mode = self.rotation_mode
+        light.rotation_euler = self.rotation_euler
+        if self.pivot is not None:
+            light["Lumi_pivot_world"] = self.pivot
+        elif drop_new_pivot:
+            # Drop any pivot the drag created, no membership test needed
+            light.pop("Lumi_pivot_world", None)
+
+
 def lumi_handle_modal_error(operator, context, error: Exception, operation_name: str) -> set:
     """Centralized error handling for modal operators
     
@@ -110,6 +453,29 @@ def lumi_handle_positioning_error(operator, context, error: Exception, operation
     # Silent handling for minor errors
 
 
+# Positioning mode per modifier combination, indexed by (ctrl << 2) | (alt << 1) | shift
+_MODE_TABLE = (
+    None,          # none
+    'NORMAL',      # Shift
+    'ORBIT',       # Alt
+    'MOVE',        # Alt+Shift
+    'HIGHLIGHT',   # Ctrl
+    'FREE',        # Ctrl+Shift
+    'TARGET',      # Ctrl+Alt
+    None,          # Ctrl+Alt+Shift
+)
+
+# Modifier keys description per positioning mode
+_MODE_MODIFIER_KEYS = {
+    'HIGHLIGHT': 'Ctrl',
+    'NORMAL': 'Shift',
+    'ORBIT': 'Alt',
+    'TARGET': 'Ctrl+Alt',
+    'FREE': 'Ctrl+Shift',
+    'MOVE': 'Shift+Alt'
+}
+
+
 def detect_positioning_mode(event: bpy.types.Event) -> str:
     """Detect positioning mode based on modifier keys
     
@@ -119,20 +485,7 @@ def detect_positioning_mode(event: bpy.types.Event) -> str:
     Returns:
         str: Mode name (HIGHLIGHT, NORMAL, ORBIT, TARGET, FREE, MOVE) or None
     """
-    if event.ctrl and not event.shift and not event.alt:
-        return 'HIGHLIGHT'
-    elif not event.ctrl and event.shift and not event.alt:
-        return 'NORMAL'
-    elif not event.ctrl and not event.shift and event.alt:
-        return 'ORBIT'
-    elif event.ctrl and not event.shift and event.alt:
-        return 'TARGET'
-    elif event.ctrl and event.shift and not event.alt:
-        return 'FREE'
-    elif not event.ctrl and event.shift and event.alt:
-        return 'MOVE'
-    else:
-        return None
+    return _MODE_TABLE[(bool(event.ctrl) << 2) | (bool(event.alt) << 1) | bool(event.shift)]
 
 
 def get_modifier_keys_for_mode(mode: str) -> str:
@@ -144,15 +497,7 @@ def get_modifier_keys_for_mode(mode: str) -> str:
     Returns:
         str: Modifier keys description
     """
-    modifier_map = {
-        'HIGHLIGHT': 'Ctrl',
-        'NORMAL': 'Shift',
-        'ORBIT': 'Alt',
-        'TARGET': 'Ctrl+Alt',
-        'FREE': 'Ctrl+Shift',
-        'MOVE': 'Shift+Alt'
-    }
-    return modifier_map.get(mode, '')
+    return _MODE_MODIFIER_KEYS.get(mode, '')
 
 
 # Export positioning-specific utilities
@@ -160,6 +505,16 @@ __all__ = [
     'lumi_disable_all_positioning_ops',
     'lumi_get_active_power_value',
     'validate_positioning_target',
+    'lumi_get_view3d_areas',
+    'lumi_tag_view3d_redraw',
+    'lumi_scene_has_instances',
+    'lumi_build_bvh_cache',
+    'lumi_build_cache_bounds',
+    'lumi_bvh_ray_cast',
+    'lumi_scene_ray_cast',
+    'lumi_world_bounds',
+    'lumi_ray_hits_aabb',
+    'InitialTransform',
     'lumi_handle_modal_error',
     'lumi_handle_positioning_error',
     'detect_positioning_mode',
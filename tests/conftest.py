@@ -0,0 +1,43 @@
+# LumiFlow - Smart lighting tools for Blender
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2024 LumiFlow Developer
+
+"""
+Test Fixtures
+The addon modules import bpy, so these tests run inside Blender's bundled Python, e.g.
+blender -b --python-expr "import pytest; pytest.main(['tests'])". They are skipped elsewhere.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BPY_AVAILABLE = importlib.util.find_spec("bpy") is not None
+
+
+def pytest_collection_modifyitems(config, items):
+    # Skip before setup: the addon package __init__ itself imports bpy
+    if BPY_AVAILABLE:
+        return
+    skip_without_bpy = pytest.mark.skip(reason="requires Blender's bpy module")
+    for item in items:
+        item.add_marker(skip_without_bpy)
+
+
+@pytest.fixture(scope="session")
+def addon_module():
+    """Return a loader for addon submodules by dotted path, e.g. 'operators.positioning.utils'"""
+    parent = os.path.dirname(ADDON_ROOT)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    package = os.path.basename(ADDON_ROOT)
+
+    def load(name):
+        return importlib.import_module(f"{package}.{name}")
+
+    return load
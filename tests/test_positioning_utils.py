@@ -0,0 +1,138 @@
+# LumiFlow - Smart lighting tools for Blender
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2024 LumiFlow Developer
+
+"""Tests for positioning raycast helpers"""
+
+import pytest
+
+
+@pytest.fixture
+def empty_scene():
+    import bpy
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    return bpy.context
+
+
+def _plane(name, z):
+    import bpy
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata([(-1.0, -1.0, z), (1.0, -1.0, z), (1.0, 1.0, z), (-1.0, 1.0, z)], [], [(0, 1, 2, 3)])
+    return bpy.data.objects.new(name, mesh)
+
+
+def test_collection_instance_is_hit(addon_module, empty_scene):
+    import bpy
+    from mathutils import Vector
+
+    utils = addon_module("operators.positioning.utils")
+
+    # Source plane lives only in a collection that is not linked to the scene
+    collection = bpy.data.collections.new("Instanced")
+    collection.objects.link(_plane("Source", 0.0))
+    instancer = bpy.data.objects.new("Instancer", None)
+    instancer.instance_type = 'COLLECTION'
+    instancer.instance_collection = collection
+    instancer.location = (0.0, 0.0, -5.0)
+    empty_scene.scene.collection.objects.link(instancer)
+    empty_scene.view_layer.update()
+
+    assert utils.lumi_scene_has_instances(empty_scene)
+    bvh_cache = utils.lumi_build_bvh_cache(empty_scene)
+    assert bvh_cache is None
+    assert utils.lumi_world_bounds(empty_scene) is None
+
+    hit, location, normal, _ = utils.lumi_scene_ray_cast(
+        empty_scene, bvh_cache, Vector((0.0, 0.0, 10.0)), Vector((0.0, 0.0, -1.0))
+    )
+    assert hit
+    assert location.z == pytest.approx(-5.0)
+
+
+def test_plain_mesh_uses_bvh_cache(addon_module, empty_scene):
+    from mathutils import Vector
+
+    utils = addon_module("operators.positioning.utils")
+
+    empty_scene.scene.collection.objects.link(_plane("Floor", -2.0))
+    empty_scene.view_layer.update()
+
+    bvh_cache = utils.lumi_build_bvh_cache(empty_scene)
+    assert bvh_cache is not None and len(bvh_cache) == 1
+
+    hit, location, normal, _ = utils.lumi_scene_ray_cast(
+        empty_scene, bvh_cache, Vector((0.0, 0.0, 10.0)), Vector((0.0, 0.0, -1.0)),
+        utils.lumi_build_cache_bounds(bvh_cache)
+    )
+    assert hit
+    assert location.z == pytest.approx(-2.0)
+
+
+def test_bounds_pruned_cast_matches_brute_force(addon_module, empty_scene):
+    from mathutils import Vector
+
+    utils = addon_module("operators.positioning.utils")
+
+    # Stacked planes, plus a wide one whose box contains the ray origin
+    for index, z in enumerate((-1.0, -3.0, -6.0)):
+        empty_scene.scene.collection.objects.link(_plane(f"Plane{index}", z))
+    enclosing = _plane("Enclosing", 4.0)
+    enclosing.scale = (50.0, 50.0, 1.0)
+    enclosing.location = (0.0, 0.0, 0.0)
+    empty_scene.scene.collection.objects.link(enclosing)
+    empty_scene.view_layer.update()
+
+    bvh_cache = utils.lumi_build_bvh_cache(empty_scene)
+    bounds = utils.lumi_build_cache_bounds(bvh_cache)
+
+    for origin in (Vector((0.0, 0.0, 10.0)), Vector((0.0, 0.0, 4.0)), Vector((0.5, 0.5, -2.0))):
+        direction = Vector((0.0, 0.0, -1.0))
+        expected = utils.lumi_bvh_ray_cast(bvh_cache, origin, direction)
+        pruned = utils.lumi_bvh_ray_cast(bvh_cache, origin, direction, bounds)
+        assert pruned[0] == expected[0]
+        if expected[0]:
+            assert (pruned[1] - expected[1]).length == pytest.approx(0.0, abs=1e-6)
+            assert pruned[3] == expected[3]
+
+
+def _wedge(name, z):
+    import bpy
+
+    # Slanted triangle over half of its box; the box bottom sits at z
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata([(-1.0, -1.0, z), (1.0, -1.0, z), (-1.0, 1.0, z + 1.0)], [], [(0, 1, 2)])
+    return bpy.data.objects.new(name, mesh)
+
+
+@pytest.mark.parametrize("floor_first", (True, False))
+@pytest.mark.parametrize("gap", (0.0, 5e-5))
+def test_touching_boxes_keep_the_floor(addon_module, empty_scene, floor_first, gap):
+    from mathutils import Vector
+
+    utils = addon_module("operators.positioning.utils")
+
+    # Floor box top meets the wedge box bottom, either exactly or within the old march step
+    floor = _plane("Floor", -gap)
+    floor.scale = (10.0, 10.0, 1.0)
+    wedge = _wedge("Wedge", 0.0)
+    for obj in ((floor, wedge) if floor_first else (wedge, floor)):
+        empty_scene.scene.collection.objects.link(obj)
+    empty_scene.view_layer.update()
+
+    bvh_cache = utils.lumi_build_bvh_cache(empty_scene)
+    bounds = utils.lumi_build_cache_bounds(bvh_cache)
+
+    # Rays through the empty half of the wedge box, from above it and from inside it
+    rays = (
+        (Vector((0.9, 0.9, 10.0)), Vector((0.0, 0.0, -1.0))),
+        (Vector((0.9, 0.9, 0.5)), Vector((0.05, 0.0, -1.0))),
+    )
+    for origin, direction in rays:
+        expected = utils.lumi_bvh_ray_cast(bvh_cache, origin, direction)
+        pruned = utils.lumi_bvh_ray_cast(bvh_cache, origin, direction, bounds)
+        assert expected[0] and expected[3] == floor
+        assert pruned[0] == expected[0]
+        assert pruned[3] == expected[3]
+        assert (pruned[1] - expected[1]).length == pytest.approx(0.0, abs=1e-6)
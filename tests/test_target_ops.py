@@ -0,0 +1,97 @@
+# LumiFlow - Smart lighting tools for Blender
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2024 LumiFlow Developer
+
+"""Tests for the target positioning modal"""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+def _event(event_type, value, ctrl=False, alt=False, shift=False):
+    return SimpleNamespace(
+        type=event_type, value=value, ctrl=ctrl, alt=alt, shift=shift,
+        mouse_region_x=0, mouse_region_y=0
+    )
+
+
+def _operator(cancelled):
+    # modal() only needs validation and cancel from the instance on this path
+    return SimpleNamespace(
+        _dragging=True,
+        validate_modal_context=lambda context, event: True,
+        cancel=lambda context: cancelled.append(context) or {'CANCELLED'},
+    )
+
+
+def test_modifier_release_keys_are_blender_event_types(addon_module):
+    import bpy
+
+    target_ops = addon_module("operators.positioning.target_ops")
+    event_types = bpy.types.Event.bl_rna.properties['type'].enum_items.keys()
+    assert target_ops.MODIFIER_RELEASE_KEYS <= set(event_types)
+    assert target_ops.WHEEL_EVENT_TYPES <= set(event_types)
+
+
+def test_ctrl_release_cancels_target_drag(addon_module):
+    target_ops = addon_module("operators.positioning.target_ops")
+    cancelled = []
+    context = SimpleNamespace(scene=SimpleNamespace())
+
+    result = target_ops.LUMI_OT_target_positioning.modal(
+        _operator(cancelled), context, _event('LEFT_CTRL', 'RELEASE', alt=True)
+    )
+
+    assert result == {'CANCELLED'}
+    assert cancelled == [context]
+
+
+def test_release_with_both_modifiers_held_keeps_dragging(addon_module):
+    target_ops = addon_module("operators.positioning.target_ops")
+    cancelled = []
+    context = SimpleNamespace(scene=SimpleNamespace())
+
+    # Releasing the right Alt while the left one is still down leaves Ctrl+Alt held
+    result = target_ops.LUMI_OT_target_positioning.modal(
+        _operator(cancelled), context, _event('RIGHT_ALT', 'RELEASE', ctrl=True, alt=True)
+    )
+
+    assert result == {'PASS_THROUGH'}
+    assert cancelled == []
+
+
+def test_release_applies_throttled_cast(addon_module):
+    target_ops = addon_module("operators.positioning.target_ops")
+    casts = []
+    operator = SimpleNamespace(
+        _dragging=True,
+        _cast_pending=True,
+        validate_modal_context=lambda context, event: True,
+        cast_target_position=lambda context, now: casts.append(now),
+        cleanup=lambda context: None,
+        report=lambda level, message: None,
+    )
+    context = SimpleNamespace(scene=SimpleNamespace())
+
+    result = target_ops.LUMI_OT_target_positioning.modal(
+        operator, context, _event('LEFTMOUSE', 'RELEASE', ctrl=True, alt=True)
+    )
+
+    assert result == {'FINISHED'}
+    assert len(casts) == 1
+
+
+def test_batched_track_eulers_match_mathutils(addon_module):
+    import numpy as np
+    from mathutils import Vector
+
+    target_ops = addon_module("operators.positioning.target_ops")
+    rng = np.random.default_rng(0)
+    # Includes lights well below the target, whose aims mathutils resolves with the flipped twin
+    locations = rng.uniform(-5.0, 5.0, size=(256, 3))
+    target = (0.5, -0.25, 1.0)
+
+    for location, euler in zip(locations, target_ops._track_eulers(locations, target)):
+        expected = (Vector(target) - Vector(location)).to_track_quat('-Z', 'Y').to_euler('XYZ')
+        assert tuple(euler) == pytest.approx(tuple(expected), abs=1e-5)
@@ -21,6 +21,7 @@ from .utils import (
 from ...utils import lumi_rgb_to_hsv, lumi_get_light_pivot, lumi_get_light_collection
 from ...utils.light import lumi_get_selected_lights
 from ...utils.mode_manager import ModeManager
+from ...core.state import get_state
 
 
 # ============================================================================
@@ -235,6 +236,29 @@ def get_selected_light_tips_template(selected_light, colors=None):
 # CURSOR OVERLAY - Smart control value display at cursor
 # ============================================================================
 
+# Positioning modals that track the cursor on the operator instance instead of
+# writing scene.lumi_smart_mouse_x/y on every MOUSEMOVE
+CURSOR_TRACKING_MODALS = ('free', 'highlight', 'move', 'align')
+
+
+def get_overlay_cursor_position(scene, region):
+    """Get cursor position from the active positioning modal, falling back to scene properties"""
+    modal_operators = get_state().modal_operators
+    for modal_id in CURSOR_TRACKING_MODALS:
+        operator = modal_operators.get(modal_id)
+        if operator is None:
+            continue
+        try:
+            return operator._mouse_x, operator._mouse_y
+        except ReferenceError:
+            # Operator was freed without unregistering
+            modal_operators.pop(modal_id, None)
+    
+    mouse_x = getattr(scene, "lumi_smart_mouse_x", region.width // 2)
+    mouse_y = getattr(scene, "lumi_smart_mouse_y", region.height // 2)
+    return mouse_x, mouse_y
+
+
 def draw_overlay_cursor():
     """Draw smart control overlay with current value and controls using OverlayConfig."""
     context = bpy.context
@@ -266,8 +290,7 @@ def draw_overlay_cursor():
     
     scroll_mode = getattr(scene, 'lumi_smart_mode', 'DISTANCE')
     
-    mouse_x = getattr(scene, "lumi_smart_mouse_x", region.width // 2)
-    mouse_y = getattr(scene, "lumi_smart_mouse_y", region.height // 2)
+    mouse_x, mouse_y = get_overlay_cursor_position(scene, region)
     
     center = Vector((mouse_x, mouse_y))
 